@@ -1,7 +1,8 @@
 import os
 from openai import AzureOpenAI, APIConnectionError
-from typing import List
+from typing import Any, Dict, List, Optional
 from .base import LLMProvider
+from src.instrumentation import traced, record
 
 class AzureOpenAIProvider(LLMProvider):
     """LLM Provider for Azure OpenAI Service."""
@@ -10,6 +11,9 @@ class AzureOpenAIProvider(LLMProvider):
     api_version: str
     deployment_name: str
     client: AzureOpenAI = None # Define client as a field
+    # Output size for text-embedding-3 deployments, which return shortened embeddings natively.
+    # Leave unset for older models such as text-embedding-ada-002, which reject the parameter.
+    embedding_dimensions: Optional[int] = None
 
     def __post_init__(self):
         # Ensure the endpoint has a protocol
@@ -22,23 +26,48 @@ class AzureOpenAIProvider(LLMProvider):
         )
         self.model_name = self.deployment_name
 
+    @traced("llm.generate_text")
     def generate_text(self, prompt: str) -> str:
         try:
             response = self.client.chat.completions.create(
                 model=self.deployment_name,
                 messages=[{"role": "user", "content": prompt}]
             )
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
+            usage = getattr(response, "usage", None)
+            record(
+                prompt_tokens=getattr(usage, "prompt_tokens", 0),
+                completion_tokens=getattr(usage, "completion_tokens", 0),
+                bytes_in=len(prompt.encode("utf-8")),
+                bytes_out=len((content or "").encode("utf-8")),
+            )
+            return content
         except APIConnectionError as e:
             raise ConnectionError(f"Could not connect to Azure OpenAI: {e}") from e
 
+    def _embedding_options(self) -> Dict[str, Any]:
+        return {"dimensions": self.embedding_dimensions} if self.embedding_dimensions else {}
+
+    @traced("llm.generate_embedding")
     def generate_embedding(self, text: str) -> List[float]:
         try:
-            response = self.client.embeddings.create(input=text, model=self.deployment_name)
+            response = self.client.embeddings.create(input=text, model=self.deployment_name, **self._embedding_options())
+            usage = getattr(response, "usage", None)
+            record(prompt_tokens=getattr(usage, "prompt_tokens", 0), bytes_in=len(text.encode("utf-8")))
             return response.data[0].embedding
         except APIConnectionError as e:
             raise ConnectionError(f"Could not connect to Azure OpenAI: {e}") from e
 
+    @traced("llm.generate_embeddings")
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        try:
+            response = self.client.embeddings.create(input=texts, model=self.deployment_name, **self._embedding_options())
+            usage = getattr(response, "usage", None)
+            record(prompt_tokens=getattr(usage, "prompt_tokens", 0), bytes_in=sum(len(t.encode("utf-8")) for t in texts))
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except APIConnectionError as e:
+            raise ConnectionError(f"Could not connect to Azure OpenAI: {e}") from e
+
     def get_model_name(self) -> str:
         return self.model_name
 
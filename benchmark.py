@@ -0,0 +1,349 @@
+"""Offline performance benchmarks for the PDF intelligence pipeline.
+
+Everything runs locally: PDFs are generated on the fly, the LLM is a deterministic
+FakeLLMProvider with configurable latency and Qdrant runs in memory.
+
+    python benchmark.py --sizes 10 100 --output bench.json
+    python benchmark.py --output new.json --compare bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import FastAPI
+from qdrant_client import QdrantClient
+
+from fixtures import VOCABULARY, legacy_pages, make_synthetic_pdf, retained_bytes
+from src.fastapi_adapter import create_router
+from src.ingestion import BulkIngestor
+from src.instrumentation import InMemorySink, configure
+from src.llm_providers.fake import FakeLLMProvider
+from src.pdf_processing.document import Document
+from src.pdf_processing.processor import PDFProcessor
+from src.vector_store.qdrant_store import VectorStore
+from src.vector_store.reduction import EmbeddingReducer, PCAReducer, RandomProjectionReducer
+from src.agents.summarization_agents import DocumentSummaryAgent
+from src.agents.comparison_qa_agent import ComparisonQAAgent
+
+DEFAULT_SIZES = [10, 100, 500, 2000]
+
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        "p50_ms": pick(0.50) * 1000,
+        "p95_ms": pick(0.95) * 1000,
+        "p99_ms": pick(0.99) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+    }
+
+
+def recall_at_k(exact: List[List[int]], approximate: List[List[int]]) -> float:
+    """Mean fraction of each query's exact top-k ids that the approximate search also returned."""
+    hits = [len(set(a) & set(e)) / len(e) for e, a in zip(exact, approximate) if e]
+    return sum(hits) / len(hits) if hits else 0.0
+
+
+def _timed(func: Callable[[], Any], repeat: int = 1) -> Tuple[Any, float]:
+    """Runs `func` `repeat` times and returns its last result with the fastest wall time."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+class BenchmarkSuite:
+    """Runs each benchmark stage and collects flat, comparable result records."""
+
+    def __init__(self, workdir: str, text_latency: float = 0.0, embedding_latency: float = 0.0, queries: int = 50, repeat: int = 3):
+        self.workdir = workdir
+        self.repeat = repeat
+        self.provider = FakeLLMProvider(text_latency=text_latency, embedding_latency=embedding_latency)
+        self.pdf_processor = PDFProcessor()
+        self.queries = queries
+        self.results: List[Dict[str, Any]] = []
+
+    def add(self, benchmark: str, size: Optional[int], metric: str, value: float, higher_is_better: bool):
+        self.results.append({
+            "benchmark": benchmark,
+            "size": size,
+            "metric": metric,
+            "value": value,
+            "higher_is_better": higher_is_better,
+        })
+
+    def _new_store(self, name: str) -> VectorStore:
+        return VectorStore(client=QdrantClient(":memory:"), collection_name=name)
+
+    def write_pdf(self, pages: int, seed: int = 0) -> str:
+        path = os.path.join(self.workdir, f"synthetic_{pages}_{seed}.pdf")
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(make_synthetic_pdf(pages, seed=seed))
+        return path
+
+    def run_startup(self, modules=("src.llm_providers.provider_factory", "main")):
+        """Measures cold import time of each module in a fresh interpreter, net of interpreter startup."""
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+        def spawn(code: str):
+            return lambda: subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True)
+
+        _, interpreter = _timed(spawn("pass"), self.repeat)
+        for module in modules:
+            _, elapsed = _timed(spawn(f"import {module}"), self.repeat)
+            self.add(f"startup.import.{module}", None, "import_ms", max(elapsed - interpreter, 0.0) * 1000, False)
+
+    def run_bulk_ingestion(self, documents: int = 20, pages: int = 10):
+        """Ingests a directory of synthetic PDFs through the BulkIngestor pipeline."""
+        corpus = os.path.join(self.workdir, f"corpus_{documents}x{pages}")
+        os.makedirs(corpus, exist_ok=True)
+        for seed in range(documents):
+            with open(os.path.join(corpus, f"doc_{seed}.pdf"), "wb") as f:
+                f.write(make_synthetic_pdf(pages, seed=seed))
+        ingestor = BulkIngestor(self.provider, self._new_store(f"bulk_{documents}x{pages}"))
+        stats = ingestor.run(corpus)
+        self.add("bulk_ingestion", documents * pages, "docs_per_min", stats["docs_per_min"], True)
+        self.add("bulk_ingestion", documents * pages, "chunks_per_sec", stats["chunks_per_sec"], True)
+
+    def run_reduction(self, pages: int = 300, dimensions=(256, 128, 64), top_k: int = 10):
+        """Recall@k and search latency of reduced-dimension collections against full-size vectors."""
+        content = self.pdf_processor.extract_content(self.write_pdf(pages))
+        chunks = self.pdf_processor.semantic_chunking(content)
+        embeddings = self.provider.generate_embeddings(chunks)
+        rng = random.Random(pages)
+        queries = self.provider.generate_embeddings([" ".join(rng.choice(VOCABULARY) for _ in range(6)) for _ in range(self.queries)])
+
+        def evaluate(name: str, reducer: Optional[EmbeddingReducer]) -> List[List[int]]:
+            store = VectorStore(client=QdrantClient(":memory:"), collection_name=name, vector_size=len(embeddings[0]), reducer=reducer)
+            if reducer is not None:
+                store.fit_reducer(embeddings)
+            store.store_embeddings(chunks, embeddings, [{"chunk": i} for i in range(len(chunks))])
+            found, samples = [], []
+            for query in queries:
+                hits, elapsed = _timed(lambda: store.retrieve_similar(query, top_k=top_k))
+                found.append([hit["metadata"]["chunk"] for hit in hits])
+                samples.append(elapsed)
+            self.add(name, pages, "p50_ms", latency_stats(samples)["p50_ms"], False)
+            self.add(name, pages, "vector_bytes", store.vector_size * 4, False)
+            return found
+
+        exact = evaluate(f"reduction.full_{len(embeddings[0])}", None)
+        for dimension in dimensions:
+            for reducer in (PCAReducer(dimension), RandomProjectionReducer(dimension)):
+                name = f"reduction.{reducer.kind}_{dimension}"
+                self.add(name, pages, f"recall_at_{top_k}", recall_at_k(exact, evaluate(name, reducer)), True)
+
+    def run_api_load(self, concurrency: int = 16, requests: int = 64, text_latency: float = 0.1, pages: int = 5):
+        """Concurrent streamed summaries through the FastAPI adapter against a provider with `text_latency`.
+
+        Job polls are interleaved with the summaries; their latency shows whether slow LLM
+        calls hold up the event loop.
+        """
+        provider = FakeLLMProvider(text_latency=text_latency, embedding_latency=self.provider.embedding_latency)
+        qa_agent = ComparisonQAAgent(llm_provider=provider, pdf_processor=self.pdf_processor, vector_store=self._new_store("api_load"))
+        app = FastAPI()
+        app.include_router(create_router({
+            "document_summary": DocumentSummaryAgent(llm_provider=provider, pdf_processor=self.pdf_processor),
+            "comparison_qa": qa_agent,
+        }))
+        with open(self.write_pdf(pages), "rb") as f:
+            pdf_bytes = f.read()
+
+        async def load():
+            summaries, polls = [], []
+            limit = asyncio.Semaphore(concurrency)
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+                async def summarize():
+                    async with limit:
+                        start = time.perf_counter()
+                        response = await client.post("/summaries", files={"file": ("bench.pdf", pdf_bytes, "application/pdf")})
+                        if "event: summary" not in response.text:
+                            raise RuntimeError(f"Summary request failed: {response.text[:200]}")
+                        summaries.append(time.perf_counter() - start)
+
+                async def poll():
+                    for _ in range(requests):
+                        start = time.perf_counter()
+                        await client.get("/jobs/unknown")
+                        polls.append(time.perf_counter() - start)
+                        await asyncio.sleep(text_latency / 4)
+
+                start = time.perf_counter()
+                await asyncio.gather(poll(), *(summarize() for _ in range(requests)))
+                return summaries, polls, time.perf_counter() - start
+
+        summaries, polls, elapsed = asyncio.run(load())
+        self.add("api.summary", concurrency, "requests_per_sec", requests / elapsed, True)
+        for metric, value in latency_stats(summaries).items():
+            self.add("api.summary", concurrency, metric, value, False)
+        self.add("api.poll_under_load", concurrency, "p95_ms", latency_stats(polls)["p95_ms"], False)
+
+    def run_size(self, pages: int):
+        pdf_path = self.write_pdf(pages)
+
+        content, elapsed = _timed(lambda: self.pdf_processor.extract_content(pdf_path), self.repeat)
+        self.add("extraction", pages, "pages_per_sec", pages / elapsed, True)
+
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+        _, elapsed = _timed(lambda: self.pdf_processor.extract_content(pdf_bytes), self.repeat)
+        self.add("extraction.from_bytes", pages, "pages_per_sec", pages / elapsed, True)
+
+        page_texts = [page.text for page in content]
+        self.add("document_model.legacy", pages, "bytes_per_page", retained_bytes(legacy_pages, page_texts) / pages, False)
+        self.add("document_model.compact", pages, "bytes_per_page", retained_bytes(Document.from_page_texts, page_texts) / pages, False)
+
+        stripping_processor = PDFProcessor(remove_boilerplate=True)
+        stripped, elapsed = _timed(lambda: stripping_processor.extract_content(pdf_path), self.repeat)
+        report = stripped.boilerplate_report
+        total_tokens = len(content.text) // 4
+        self.add("boilerplate", pages, "pages_per_sec", pages / elapsed, True)
+        self.add("boilerplate", pages, "tokens_saved", report["tokens_saved"], True)
+        self.add("boilerplate", pages, "tokens_saved_ratio", report["tokens_saved"] / max(total_tokens, 1), True)
+
+        chunks, elapsed = _timed(lambda: self.pdf_processor.semantic_chunking(content), self.repeat)
+        self.add("chunking", pages, "chunks_per_sec", len(chunks) / max(elapsed, 1e-9), True)
+
+        store = self._new_store(f"bench_{pages}")
+        embeddings, embed_elapsed = _timed(lambda: [self.provider.generate_embedding(chunk) for chunk in chunks])
+        self.add("embedding", pages, "chunks_per_sec", len(chunks) / embed_elapsed, True)
+        _, store_elapsed = _timed(lambda: store.store_embeddings(chunks, embeddings, [{"page_number": i + 1} for i in range(len(chunks))]))
+        self.add("ingestion", pages, "chunks_per_sec", len(chunks) / (embed_elapsed + store_elapsed), True)
+
+        rng = random.Random(pages)
+        samples = []
+        for _ in range(self.queries):
+            query = " ".join(rng.choice(VOCABULARY) for _ in range(6))
+            _, elapsed = _timed(lambda: store.retrieve_similar(self.provider.generate_embedding(query), top_k=10))
+            samples.append(elapsed)
+        for metric, value in latency_stats(samples).items():
+            self.add("retrieval", pages, metric, value, False)
+
+        self.run_agents(pages, pdf_path)
+
+    def run_agents(self, pages: int, pdf_path: str):
+        sink = InMemorySink()
+        configure(sink)
+        try:
+            summary_agent = DocumentSummaryAgent(llm_provider=self.provider, pdf_processor=self.pdf_processor)
+            _, elapsed = _timed(lambda: summary_agent.run(pdf_path), self.repeat)
+            self.add("agent.document_summary", pages, "latency_ms", elapsed * 1000, False)
+
+            qa_agent = ComparisonQAAgent(
+                llm_provider=self.provider,
+                pdf_processor=self.pdf_processor,
+                vector_store=self._new_store(f"bench_qa_{pages}"),
+            )
+            other_path = self.write_pdf(pages, seed=1)
+            _, elapsed = _timed(lambda: qa_agent.run(pdf_path, other_path, "What are the payment and termination terms?"))
+            self.add("agent.comparison_qa", pages, "latency_ms", elapsed * 1000, False)
+
+            questions = [f"What does the document say about {word}?" for word in VOCABULARY[:8]]
+            _, elapsed = _timed(lambda: qa_agent.run_batch(pdf_path, other_path, questions))
+            self.add("agent.comparison_qa_batch", pages, "latency_ms", elapsed * 1000, False)
+
+            # Per-stage breakdown (summed over every repetition) of the agent runs, from the instrumentation spans.
+            stages = (
+                "pdf.extract", "pdf.chunk", "llm.generate_embedding", "llm.generate_embeddings", "llm.generate_text",
+                "vector_store.delete_documents", "vector_store.upsert", "vector_store.search", "vector_store.search_batch",
+            )
+            for span_name in stages:
+                total = sum(span.duration for span in sink.find(span_name))
+                self.add(f"agent.stage.{span_name}", pages, "total_ms", total * 1000, False)
+        finally:
+            configure()
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Returns a description of every metric that got worse than the baseline by more than `tolerance`."""
+    def key(entry):
+        return entry["benchmark"], entry["size"], entry["metric"]
+
+    previous = {key(entry): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        old = previous.get(key(entry))
+        if not old or not old["value"]:
+            continue
+        change = (entry["value"] - old["value"]) / old["value"]
+        worse = -change if entry["higher_is_better"] else change
+        if worse > tolerance:
+            regressions.append(
+                f"{entry['benchmark']} size={entry['size']} {entry['metric']}: {old['value']:.3f} -> {entry['value']:.3f} ({worse:+.1%} worse)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the PDF intelligence pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Synthetic PDF sizes in pages.")
+    parser.add_argument("--text-latency", type=float, default=0.0, help="Simulated seconds per generate_text call.")
+    parser.add_argument("--embedding-latency", type=float, default=0.0, help="Simulated seconds per embedding call.")
+    parser.add_argument("--queries", type=int, default=50, help="Retrieval queries per size.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per timed stage; the fastest is kept.")
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression before failing.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        suite = BenchmarkSuite(workdir, args.text_latency, args.embedding_latency, args.queries, args.repeat)
+        suite.run_startup()
+        suite.run_bulk_ingestion()
+        suite.run_reduction()
+        suite.run_api_load()
+        for pages in args.sizes:
+            suite.run_size(pages)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "text_latency": args.text_latency,
+            "embedding_latency": args.embedding_latency,
+        },
+        "results": suite.results,
+    }
+    for entry in suite.results:
+        print(f"{entry['benchmark']:<36} size={entry['size']!s:<6} {entry['metric']:<16} {entry['value']:.3f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
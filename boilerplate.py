@@ -0,0 +1,97 @@
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\d+")
+# Page labels such as "3", "- 3 -", "Page 3", "page 3 of 40" or "3/40", with digits masked.
+_PAGE_LABEL_RE = re.compile(r"^[-\u2013\u2014 ]*(?:page ?)?#+(?: ?(?:of|/) ?#+)?[-\u2013\u2014 ]*$")
+
+def line_key(line: str) -> str:
+    """Key under which lines count as repeats: case and spacing are ignored, and so are the
+    numbers of page labels, so "Page 3 of 40" and "page 4 of 40" are the same footer.
+
+    Numbers elsewhere are kept, so table rows like "Total 10" and "Total 12" stay distinct.
+    """
+    key = _WHITESPACE_RE.sub(" ", line).strip().casefold()
+    masked = _DIGITS_RE.sub("#", key)
+    return masked if _PAGE_LABEL_RE.match(masked) else key
+
+class BoilerplateFilter:
+    """Detects lines repeated across the pages of a document and strips them.
+
+    A line is boilerplate when the same key appears at the same offset from the top or
+    bottom of a page (running headers, footers, page numbers) on enough pages, or, for
+    longer lines such as legal notices, anywhere on enough pages.
+    """
+
+    def __init__(self, min_pages: int = 3, min_ratio: float = 0.5, edge_lines: int = 3, min_body_chars: int = 30):
+        self.min_pages = min_pages
+        self.min_ratio = min_ratio
+        self.edge_lines = edge_lines
+        self.min_body_chars = min_body_chars
+
+    def _positions(self, index: int, count: int) -> List[Tuple[str, int]]:
+        # At most a third of a page's lines count as its top or bottom edge, so the body of
+        # a short page is never compared as header or footer.
+        edge_lines = min(self.edge_lines, count // 3)
+        positions = []
+        if index < edge_lines:
+            positions.append(("top", index))
+        if count - 1 - index < edge_lines:
+            positions.append(("bottom", count - 1 - index))
+        return positions
+
+    def clean(self, pages: List[str]) -> Tuple[List[str], Dict[str, Any]]:
+        """Returns the pages without boilerplate lines, and a report of what was removed."""
+        report = {"removed_lines": 0, "removed_chars": 0, "tokens_saved": 0, "patterns": []}
+        if len(pages) < self.min_pages:
+            return list(pages), report
+        threshold = max(self.min_pages, self.min_ratio * len(pages))
+
+        page_lines = []
+        edge_counts: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        anywhere_counts: Dict[str, int] = defaultdict(int)
+        for text in pages:
+            lines = [(line, line_key(line)) for line in (text or "").split("\n")]
+            content = [i for i, (_, key) in enumerate(lines) if key]
+            seen_edges, seen_anywhere = set(), set()
+            for rank, i in enumerate(content):
+                key = lines[i][1]
+                for position in self._positions(rank, len(content)):
+                    seen_edges.add((key, *position))
+                seen_anywhere.add(key)
+            for entry in seen_edges:
+                edge_counts[entry] += 1
+            for key in seen_anywhere:
+                anywhere_counts[key] += 1
+            page_lines.append((lines, content))
+
+        boilerplate_anywhere = {key for key, count in anywhere_counts.items() if count >= threshold and len(key) >= self.min_body_chars}
+        patterns = set(boilerplate_anywhere)
+        cleaned = []
+        for lines, content in page_lines:
+            drop = set()
+            for rank, i in enumerate(content):
+                key = lines[i][1]
+                if key in boilerplate_anywhere:
+                    drop.add(i)
+                    continue
+                for position in self._positions(rank, len(content)):
+                    if edge_counts[(key, *position)] >= threshold:
+                        drop.add(i)
+                        patterns.add(key)
+                        break
+            kept = []
+            for i, (line, _) in enumerate(lines):
+                if i in drop:
+                    report["removed_lines"] += 1
+                    report["removed_chars"] += len(line) + 1
+                else:
+                    kept.append(line)
+            cleaned.append("\n".join(kept).strip("\n"))
+
+        # Roughly four characters per token for English text with common tokenizers.
+        report["tokens_saved"] = (report["removed_chars"] + 3) // 4
+        report["patterns"] = sorted(patterns)
+        return cleaned, report
@@ -1,8 +1,14 @@
-from typing import List, Dict, Any
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence
 from pydantic import BaseModel
 from src.llm_providers.base import LLMProvider
+from src.llm_providers.embeddings import chunk_ids, embed_texts
+from src.pdf_processing.document import as_document
 from src.pdf_processing.processor import PDFProcessor
+from src.pdf_processing.source import PDFInput
 from src.vector_store.qdrant_store import VectorStore
+from src.instrumentation import traced
 from .base import Agent
 
 class ComparisonQAAgent(Agent):
@@ -13,24 +19,19 @@ class ComparisonQAAgent(Agent):
     pdf_processor: PDFProcessor
     vector_store: VectorStore
 
-    def _embed_and_store_pdf(self, pdf_path: str, doc_id: str):
-        extracted_content = self.pdf_processor.extract_content(pdf_path)
-        chunks = self.pdf_processor.semantic_chunking(extracted_content)
-        embeddings = [self.llm_provider.generate_embedding(chunk) for chunk in chunks]
+    def _embed_and_store_pdf(self, pdf_path: PDFInput, doc_id: str):
+        # Drops an earlier, possibly longer, version of the document stored under the same id.
+        self.vector_store.delete_documents([doc_id])
+        document = as_document(self.pdf_processor.extract_content(pdf_path))
+        chunks = self.pdf_processor.semantic_chunking(document)
+        embeddings = embed_texts(self.llm_provider, chunks)
         metadata = []
-        for i, page_content in enumerate(extracted_content):
-            for section in page_content["sections"]:
-                metadata.append({"doc_id": doc_id, "page_number": page_content["page_number"], "heading": section["heading"]})
-        self.vector_store.store_embeddings(chunks, embeddings, metadata)
-
-    def run(self, pdf1_path: str, pdf2_path: str, question: str) -> Dict[str, Any]:
-        # For simplicity, re-embedding each time. In a real app, manage stored PDFs.
-        self._embed_and_store_pdf(pdf1_path, "doc1")
-        self._embed_and_store_pdf(pdf2_path, "doc2")
-
-        query_embedding = self.llm_provider.generate_embedding(question)
-        similar_chunks = self.vector_store.retrieve_similar(query_embedding, top_k=10)
+        for section in document.sections:
+            metadata.append({"doc_id": doc_id, "page_number": section.page_number, "heading": section.heading})
+        # Ids derived from doc_id, so the two documents don't overwrite each other's points.
+        self.vector_store.store_embeddings(chunks, embeddings, metadata, ids=chunk_ids(doc_id, len(chunks)))
 
+    def _answer(self, question: str, similar_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
         context = ""
         references = []
         for chunk in similar_chunks:
@@ -51,6 +52,49 @@ class ComparisonQAAgent(Agent):
 
         return {"answer": answer, "references": references}
 
+    @traced("agent.run")
+    def run(self, pdf1_path: PDFInput, pdf2_path: PDFInput, question: str, doc_ids: Sequence[str] = ("doc1", "doc2")) -> Dict[str, Any]:
+        # For simplicity, re-embedding each time. In a real app, manage stored PDFs.
+        self._embed_and_store_pdf(pdf1_path, doc_ids[0])
+        self._embed_and_store_pdf(pdf2_path, doc_ids[1])
+
+        query_embedding = self.llm_provider.generate_embedding(question)
+        similar_chunks = self.vector_store.retrieve_similar(query_embedding, top_k=10, doc_ids=list(doc_ids))
+        return self._answer(question, similar_chunks)
+
+    @traced("agent.run_batch")
+    def run_batch(self, pdf1_path: PDFInput, pdf2_path: PDFInput, questions: List[str], max_workers: int = 4,
+                  on_answer: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+                  doc_ids: Sequence[str] = ("doc1", "doc2")) -> List[Dict[str, Any]]:
+        """Answers several questions about the same two PDFs.
+
+        The PDFs are embedded once, all questions are embedded in one batched call and
+        retrieved in one Qdrant round trip, and the LLM calls run concurrently. Results
+        are returned in question order, each with its own references. `on_answer` is called
+        with (index, result) as each answer completes, e.g. to stream answers to a client.
 
+        The PDFs are stored under `doc_ids` and retrieval is limited to them, so other
+        documents in the collection are never cited. Callers sharing a collection should
+        pass ids unique to the request.
+        """
+        if not questions:
+            return []
+        self._embed_and_store_pdf(pdf1_path, doc_ids[0])
+        self._embed_and_store_pdf(pdf2_path, doc_ids[1])
 
+        query_embeddings = embed_texts(self.llm_provider, questions)
+        similar_chunks = self.vector_store.retrieve_similar_batch(query_embeddings, top_k=10, doc_ids=list(doc_ids))
 
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(questions)))) as executor:
+            # Each task gets its own copy of the context so its spans nest under this run.
+            futures = {
+                executor.submit(contextvars.copy_context().run, self._answer, question, chunks): index
+                for index, (question, chunks) in enumerate(zip(questions, similar_chunks))
+            }
+            results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = {"question": questions[index], **future.result()}
+                if on_answer is not None:
+                    on_answer(index, results[index])
+        return results
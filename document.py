@@ -0,0 +1,216 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+class Section:
+    """View of one section of a Document. Also readable as the legacy section dict."""
+    __slots__ = ("_document", "_index")
+
+    def __init__(self, document: "Document", index: int):
+        self._document = document
+        self._index = index
+
+    @property
+    def page_number(self) -> int:
+        return self._document._section_pages[self._index] + 1
+
+    @property
+    def heading(self) -> str:
+        heading = self._document._headings[self._index]
+        return heading if heading is not None else f"Page {self.page_number}"
+
+    @property
+    def paragraphs(self) -> List[str]:
+        document = self._document
+        start, end = document._section_paragraphs[self._index], document._section_paragraphs[self._index + 1]
+        return [document._paragraph(i) for i in range(start, end)]
+
+    @property
+    def tables(self) -> List[Any]:
+        return []  # pypdf doesn't directly extract structured tables easily
+
+    @property
+    def text(self) -> str:
+        """Heading and paragraphs, one per line, as used for chunking and section prompts."""
+        return self.heading + "\n" + "\n".join(self.paragraphs)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ("heading", "paragraphs", "tables"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"heading": self.heading, "paragraphs": self.paragraphs, "tables": self.tables}
+
+class Page:
+    """View of one page of a Document. Also readable as the legacy page dict."""
+    __slots__ = ("_document", "_index")
+
+    def __init__(self, document: "Document", index: int):
+        self._document = document
+        self._index = index
+
+    @property
+    def page_number(self) -> int:
+        return self._index + 1
+
+    @property
+    def text(self) -> str:
+        offsets = self._document._page_offsets
+        return self._document._buffer[offsets[2 * self._index]:offsets[2 * self._index + 1]]
+
+    @property
+    def sections(self) -> List[Section]:
+        document = self._document
+        return [Section(document, i) for i in range(document._page_sections[self._index], document._page_sections[self._index + 1])]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ("page_number", "text", "sections"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"page_number": self.page_number, "text": self.text, "sections": [section.to_dict() for section in self.sections]}
+
+class Document(Sequence):
+    """Compact extracted PDF content.
+
+    All page text lives in a single string; pages and paragraphs are (start, end) offsets
+    into it and sections are index ranges, so each character is stored once and no
+    per-page dicts or lists are kept. Pages and sections are lightweight views created on
+    access, which also answer the legacy dict keys ("text", "sections", "heading", ...).
+    """
+    __slots__ = ("_buffer", "_text_end", "_page_offsets", "_page_sections", "_section_pages",
+                 "_headings", "_section_paragraphs", "_paragraph_offsets", "_boilerplate_report")
+
+    def __init__(self):
+        self._buffer = ""
+        self._text_end = 0
+        self._page_offsets = array("Q")        # start, end per page
+        self._page_sections = array("I", [0])  # section index range per page
+        self._section_pages = array("I")       # page index per section
+        self._headings: List[Optional[str]] = []  # None means the default "Page N"
+        self._section_paragraphs = array("I", [0])  # paragraph index range per section
+        self._paragraph_offsets = array("Q")   # start, end per paragraph
+        self._boilerplate_report: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_page_texts(cls, page_texts: List[str], boilerplate_report: Optional[Dict[str, Any]] = None) -> "Document":
+        """Builds a document with one section per page and paragraphs split on blank lines."""
+        document = cls()
+        document._boilerplate_report = boilerplate_report
+        position = 0
+        for page_index, text in enumerate(page_texts):
+            text = text or ""
+            document._page_offsets.extend((position, position + len(text)))
+            start = position
+            for part in text.split("\n\n"):
+                stripped = part.strip()
+                if stripped:
+                    leading = len(part) - len(part.lstrip())
+                    document._paragraph_offsets.extend((start + leading, start + leading + len(stripped)))
+                start += len(part) + 2
+            document._add_section(page_index, None)
+            document._page_sections.append(len(document._section_pages))
+            position += len(text) + 1
+        document._buffer = "\n".join(text or "" for text in page_texts)
+        document._text_end = len(document._buffer)
+        return document
+
+    @classmethod
+    def from_pages(cls, pages: List[Dict[str, Any]]) -> "Document":
+        """Builds a document from the legacy list-of-dicts representation."""
+        document = cls()
+        texts = [page.get("text") or "" for page in pages]
+        extra: List[str] = []
+        position = 0
+        page_positions = []
+        for text in texts:
+            page_positions.append(position)
+            position += len(text) + 1
+        extra_position = max(position - 1, 0)
+        for page_index, page in enumerate(pages):
+            text, base = texts[page_index], page_positions[page_index]
+            document._page_offsets.extend((base, base + len(text)))
+            for section in page.get("sections", []):
+                cursor = 0
+                for paragraph in section.get("paragraphs", []):
+                    found = text.find(paragraph, cursor)
+                    if found >= 0:
+                        document._paragraph_offsets.extend((base + found, base + found + len(paragraph)))
+                        cursor = found + len(paragraph)
+                    else:
+                        # Paragraph not present verbatim in the page text: keep it after the text.
+                        extra.append(paragraph)
+                        document._paragraph_offsets.extend((extra_position, extra_position + len(paragraph)))
+                        extra_position += len(paragraph)
+                heading = section.get("heading")
+                document._add_section(page_index, None if heading == f"Page {page_index + 1}" else heading)
+            document._page_sections.append(len(document._section_pages))
+        document._buffer = "\n".join(texts) + "".join(extra)
+        document._text_end = max(position - 1, 0)
+        return document
+
+    def _add_section(self, page_index: int, heading: Optional[str]):
+        self._section_pages.append(page_index)
+        self._headings.append(heading)
+        self._section_paragraphs.append(len(self._paragraph_offsets) // 2)
+
+    def _paragraph(self, index: int) -> str:
+        return self._buffer[self._paragraph_offsets[2 * index]:self._paragraph_offsets[2 * index + 1]]
+
+    def __len__(self) -> int:
+        return len(self._page_offsets) // 2
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Page, List[Page]]:
+        if isinstance(index, slice):
+            return [Page(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+        return Page(self, index)
+
+    def __iter__(self) -> Iterator[Page]:
+        return (Page(self, i) for i in range(len(self)))
+
+    @property
+    def pages(self) -> List[Page]:
+        return list(self)
+
+    @property
+    def sections(self) -> Iterator[Section]:
+        return (Section(self, i) for i in range(len(self._section_pages)))
+
+    @property
+    def text(self) -> str:
+        """All page texts joined by newlines."""
+        if self._text_end == len(self._buffer):
+            return self._buffer
+        return self._buffer[:self._text_end]
+
+    @property
+    def boilerplate_report(self) -> Optional[Dict[str, Any]]:
+        """What boilerplate removal stripped from the page texts; None if it was not applied."""
+        return self._boilerplate_report
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """The legacy list-of-dicts representation, e.g. for JSON output."""
+        return [page.to_dict() for page in self]
+
+def as_document(content: Union[Document, List[Dict[str, Any]]]) -> Document:
+    """Returns `content` as a Document, converting the legacy list-of-dicts form if needed."""
+    if isinstance(content, Document):
+        return content
+    return Document.from_pages(content)
@@ -0,0 +1,28 @@
+import os
+import uuid
+from typing import List
+
+from .base import LLMProvider
+
+_POINT_NAMESPACE = uuid.UUID("6f1c8a52-3d4e-4b8f-9a51-2c7e0d9b4a13")
+
+def embed_texts(llm_provider: LLMProvider, texts: List[str], batch_size: int = 64) -> List[List[float]]:
+    """Embeds `texts` in order, in batches when the provider implements `generate_embeddings`.
+
+    Providers without a batch endpoint fall back to one `generate_embedding` call per text.
+    """
+    generate_embeddings = getattr(llm_provider, "generate_embeddings", None)
+    if generate_embeddings is None:
+        return [llm_provider.generate_embedding(text) for text in texts]
+    embeddings: List[List[float]] = []
+    for start in range(0, len(texts), batch_size):
+        embeddings.extend(generate_embeddings(texts[start:start + batch_size]))
+    return embeddings
+
+def chunk_ids(doc_id: str, count: int) -> List[str]:
+    """Stable point ids, so re-ingesting a document overwrites its points instead of duplicating them."""
+    return [str(uuid.uuid5(_POINT_NAMESPACE, f"{doc_id}:{index}")) for index in range(count)]
+
+def document_fingerprint(pdf_path: str) -> str:
+    stat = os.stat(pdf_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
@@ -1,7 +1,10 @@
 from typing import List, Dict, Any
 from pydantic import BaseModel
 from src.llm_providers.base import LLMProvider
+from src.pdf_processing.document import as_document
 from src.pdf_processing.processor import PDFProcessor
+from src.pdf_processing.source import PDFInput
+from src.instrumentation import traced
 from .base import Agent
 
 class EvaluationAgent(Agent):
@@ -11,9 +14,8 @@ class EvaluationAgent(Agent):
     llm_provider: LLMProvider
     pdf_processor: PDFProcessor
 
-    def generate_questions(self, pdf_path: str, num_questions: int = 5) -> List[str]:
-        extracted_content = self.pdf_processor.extract_content(pdf_path)
-        full_text = "\n".join([page["text"] for page in extracted_content])
+    def generate_questions(self, pdf_path: PDFInput, num_questions: int = 5) -> List[str]:
+        full_text = as_document(self.pdf_processor.extract_content(pdf_path)).text
         
         prompt = f"Generate {num_questions} insightful questions based on the following document content. Provide only the questions, one per line.\n\nDocument:\n{full_text}"
         questions_str = self.llm_provider.generate_text(prompt)
@@ -24,7 +26,8 @@ class EvaluationAgent(Agent):
         evaluation_report = self.llm_provider.generate_text(prompt)
         return {"question": question, "user_answer": user_answer, "evaluation": evaluation_report}
 
-    def run(self, pdf_path: str, num_questions: int = 5) -> Dict[str, Any]:
+    @traced("agent.run")
+    def run(self, pdf_path: PDFInput, num_questions: int = 5) -> Dict[str, Any]:
         questions = self.generate_questions(pdf_path, num_questions)
         assessment_results = []
 
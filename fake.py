@@ -0,0 +1,67 @@
+import hashlib
+import math
+import re
+import time
+from typing import List
+
+from .base import LLMProvider
+from src.instrumentation import traced, record
+
+_WORD_RE = re.compile(r"\w+")
+
+class FakeLLMProvider(LLMProvider):
+    """Deterministic offline LLM provider for tests and benchmarks.
+
+    Embeddings are hashed bag-of-words vectors, so texts sharing words are close to each
+    other and retrieval behaves plausibly without any model. Latencies simulate network cost.
+    """
+    model_name: str = "fake"
+    dimension: int = 1536
+    text_latency: float = 0.0
+    embedding_latency: float = 0.0
+
+    @traced("llm.generate_text")
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        if self.text_latency:
+            time.sleep(self.text_latency)
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+        completion = f"Fake response {digest}"
+        record(
+            prompt_tokens=len(_WORD_RE.findall(prompt)),
+            completion_tokens=3,
+            bytes_in=len(prompt.encode("utf-8")),
+            bytes_out=len(completion),
+        )
+        return completion
+
+    @traced("llm.generate_embedding")
+    def generate_embedding(self, text: str) -> List[float]:
+        if self.embedding_latency:
+            time.sleep(self.embedding_latency)
+        record(prompt_tokens=len(_WORD_RE.findall(text)), bytes_in=len(text.encode("utf-8")))
+        return self._embed(text)
+
+    @traced("llm.generate_embeddings")
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        # One simulated round trip for the whole batch, like a real batch endpoint.
+        if self.embedding_latency:
+            time.sleep(self.embedding_latency)
+        record(
+            prompt_tokens=sum(len(_WORD_RE.findall(text)) for text in texts),
+            bytes_in=sum(len(text.encode("utf-8")) for text in texts),
+        )
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for word in _WORD_RE.findall(text.lower()):
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        if not any(vector):
+            vector[0] = 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def get_model_name(self) -> str:
+        return self.model_name
@@ -0,0 +1,196 @@
+"""FastAPI integration for the PDF agents.
+
+Mount the router on an application:
+
+    from fastapi import FastAPI
+    from main import get_agents
+    from src.fastapi_adapter import create_router
+
+    app = FastAPI()
+    app.include_router(create_router(get_agents()), prefix="/pdf")
+
+Uploads are read into memory and handed to the PDFProcessor as buffers, without temporary
+files. Ingestion runs as a background job whose status is polled at GET /jobs/{job_id}.
+Summaries and QA answers are streamed as server-sent events. All agent and provider calls
+run in the thread pool, so a slow LLM call does not block the event loop.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.ingestion import BulkIngestor
+
+MAX_UPLOAD_BYTES = 100 << 20
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+Emit = Callable[[str, Any], None]
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Formats one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def read_upload(upload: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> bytearray:
+    """Reads an upload in chunks into a single buffer, rejecting it once it exceeds `max_bytes`."""
+    data = bytearray()
+    while True:
+        chunk = await upload.read(_UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            return data
+        data += chunk
+        if len(data) > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+
+
+class JobRegistry:
+    """In-process registry of background jobs. Finished jobs beyond `max_finished` are dropped, oldest first."""
+
+    def __init__(self, max_finished: int = 1000):
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, **info) -> Dict[str, Any]:
+        job = {"job_id": uuid.uuid4().hex, "status": "queued", "created_at": time.time(),
+               "started_at": None, "finished_at": None, "result": None, "error": None, **info}
+        with self._lock:
+            self._jobs[job["job_id"]] = job
+            self._prune()
+            return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def run(self, job_id: str, func: Callable, *args, **kwargs):
+        """Runs `func` for the job, recording its result or error; blocking, so call it off the event loop."""
+        self._update(job_id, status="running", started_at=time.time())
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._update(job_id, status="failed", error=str(e), finished_at=time.time())
+        else:
+            self._update(job_id, status="completed", result=result, finished_at=time.time())
+
+    def _update(self, job_id: str, **changes):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(changes)
+            self._prune()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in ("completed", "failed")]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+async def event_stream(work: Callable[[Emit], Any], keepalive_interval: float = 15.0) -> AsyncIterator[str]:
+    """Runs `work(emit)` in the thread pool and yields the events it emits as they happen.
+
+    The stream opens with a "started" event and ends with "done", or "error" if `work`
+    raised. SSE comments are sent while waiting so idle proxies keep the connection open.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit(event: str, data: Any):
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    task = asyncio.ensure_future(run_in_threadpool(work, emit))
+    # Scheduled after every emit() of the worker, so it is always the last item.
+    task.add_done_callback(lambda _: events.put_nowait(None))
+    yield sse_event("started", {})
+    while True:
+        try:
+            item = await asyncio.wait_for(events.get(), timeout=keepalive_interval)
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"
+            continue
+        if item is None:
+            break
+        yield sse_event(*item)
+    if task.exception() is not None:
+        yield sse_event("error", {"detail": str(task.exception())})
+    else:
+        yield sse_event("done", {})
+
+
+def create_router(agents: Dict[str, Any], ingestor: Optional[BulkIngestor] = None, jobs: Optional[JobRegistry] = None,
+                  max_upload_bytes: int = MAX_UPLOAD_BYTES, keepalive_interval: float = 15.0) -> APIRouter:
+    """Builds an APIRouter over the agents returned by main.get_agents().
+
+    Uploaded documents are ingested with `ingestor`, which defaults to one built from the
+    comparison QA agent's provider, processor and vector store.
+    """
+    summary_agent = agents["document_summary"]
+    qa_agent = agents["comparison_qa"]
+    if ingestor is None:
+        ingestor = BulkIngestor(qa_agent.llm_provider, qa_agent.vector_store, qa_agent.pdf_processor, extract_workers=0)
+    jobs = jobs or JobRegistry()
+    router = APIRouter()
+
+    def stream(work: Callable[[Emit], Any]) -> StreamingResponse:
+        return StreamingResponse(
+            event_stream(work, keepalive_interval),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @router.post("/documents", status_code=202)
+    async def ingest_document(background_tasks: BackgroundTasks, file: UploadFile = File(...), doc_id: Optional[str] = Form(None)):
+        data = await read_upload(file, max_upload_bytes)
+        doc_id = doc_id or file.filename or uuid.uuid4().hex
+        job = jobs.create(doc_id=doc_id, filename=file.filename, bytes=len(data))
+        # Content hash as fingerprint, so uploading the same file again is a no-op.
+        fingerprint = hashlib.sha256(data).hexdigest()
+        background_tasks.add_task(jobs.run, job["job_id"], ingestor.ingest_document, data, doc_id, fingerprint)
+        return job
+
+    @router.get("/jobs/{job_id}")
+    async def get_job(job_id: str):
+        job = jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+        return job
+
+    @router.post("/summaries")
+    async def summarize(file: UploadFile = File(...)):
+        data = await read_upload(file, max_upload_bytes)
+        return stream(lambda emit: emit("summary", {"summary": summary_agent.run(data)}))
+
+    @router.post("/qa")
+    async def answer_questions(pdf1: UploadFile = File(...), pdf2: UploadFile = File(...), questions: List[str] = Form(...)):
+        data1 = await read_upload(pdf1, max_upload_bytes)
+        data2 = await read_upload(pdf2, max_upload_bytes)
+        # The uploads share the collection with ingested documents and other requests, so they
+        # are stored under ids unique to this request and removed once it is answered.
+        # References still name them "doc1" and "doc2".
+        request_id = uuid.uuid4().hex
+        doc_ids = [f"qa-{request_id}:doc1", f"qa-{request_id}:doc2"]
+        names = dict(zip(doc_ids, ("doc1", "doc2")))
+
+        def work(emit: Emit):
+            def on_answer(index: int, answer: Dict[str, Any]):
+                references = [{**reference, "document": names[reference["document"]]} for reference in answer["references"]]
+                # Answers are sent as they complete; "index" gives each one's position in `questions`.
+                emit("answer", {"index": index, **answer, "references": references})
+
+            try:
+                qa_agent.run_batch(data1, data2, questions, on_answer=on_answer, doc_ids=doc_ids)
+            finally:
+                qa_agent.vector_store.delete_documents(doc_ids)
+
+        return stream(work)
+
+    return router
@@ -0,0 +1,92 @@
+"""Synthetic PDFs and document-model helpers shared by the benchmarks and the tests.
+
+Only depends on the standard library, so tests can use it without the benchmark's
+dependencies (FastAPI, httpx, Qdrant).
+"""
+import random
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+VOCABULARY = (
+    "revenue margin forecast contract supplier warranty liability audit compliance policy "
+    "customer invoice shipment inventory capacity pricing discount renewal termination notice "
+    "quarter annual budget headcount risk control report region market product service "
+    "delivery schedule milestone payment interest balance asset equity review approval"
+).split()
+
+_HEADER = "ACME Corporation - Internal Report - Confidential"
+_FOOTER = "This document is proprietary. Distribution outside ACME is prohibited."
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_synthetic_pdf(num_pages: int, paragraphs_per_page: int = 4, lines_per_paragraph: int = 6, seed: int = 0) -> bytes:
+    """Builds a text PDF with running headers/footers and random-word paragraphs."""
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for page_number in range(1, num_pages + 1):
+        lines = [_HEADER, ""]
+        for _ in range(paragraphs_per_page):
+            for _ in range(lines_per_paragraph):
+                lines.append(" ".join(rng.choice(VOCABULARY) for _ in range(10)))
+            lines.append("")
+        lines += [_FOOTER, f"Page {page_number} of {num_pages}"]
+        body = "".join(f"({_pdf_escape(line)}) Tj T*\n" for line in lines)
+        stream = f"BT /F1 9 Tf 12 TL 40 800 Td\n{body}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % ref for ref in page_refs)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, num_pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+def legacy_pages(page_texts: List[str]) -> List[Dict[str, Any]]:
+    """The nested-dict page representation PDFProcessor produced before Document."""
+    return [
+        {
+            "page_number": page_num + 1,
+            "text": text,
+            "sections": [{
+                "heading": f"Page {page_num + 1}",
+                "paragraphs": [p.strip() for p in text.split("\n\n") if p.strip()],
+                "tables": [],
+            }],
+        }
+        for page_num, text in enumerate(page_texts)
+    ]
+
+
+def retained_bytes(build: Callable[[List[str]], Any], page_texts: List[str]) -> int:
+    """Bytes still allocated after `build` returns, including its own copy of the page texts."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        # Fresh strings, as pypdf would hand them over, so both models pay for the text.
+        result = build([text.encode("utf-8").decode("utf-8") for text in page_texts])
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
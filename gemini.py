@@ -3,6 +3,7 @@ from typing import List
 import google.generativeai as genai
 
 from .base import LLMProvider
+from src.instrumentation import traced, record
 
 class GeminiProvider(LLMProvider):
     """Google Gemini LLM provider implementation."""
@@ -12,15 +13,25 @@ class GeminiProvider(LLMProvider):
     def __post_init__(self):
         genai.configure(api_key=self.api_key)
 
+    @traced("llm.generate_text")
     def generate_text(self, prompt: str, **kwargs) -> str:
         model = genai.GenerativeModel(self.model_name)
         response = model.generate_content(prompt, **kwargs)
+        usage = getattr(response, "usage_metadata", None)
+        record(
+            prompt_tokens=getattr(usage, "prompt_token_count", 0),
+            completion_tokens=getattr(usage, "candidates_token_count", 0),
+            bytes_in=len(prompt.encode("utf-8")),
+            bytes_out=len(response.text.encode("utf-8")),
+        )
         return response.text
 
+    @traced("llm.generate_embedding")
     def generate_embedding(self, text: str) -> List[float]:
         # Gemini embedding model is typically 'embedding-001'
         model = genai.GenerativeModel('embedding-001')
         response = model.embed_content(content=text, task_type="retrieval_query")
+        record(bytes_in=len(text.encode("utf-8")))
         return response["embedding"]
 
     def get_model_name(self) -> str:
@@ -0,0 +1,340 @@
+"""Bulk ingestion of many PDFs into the vector store.
+
+Extraction and chunking run in a process pool, embedding runs in a pool of I/O threads and
+a single writer upserts into Qdrant in bulk. Stages are connected by bounded queues, so a
+slow stage applies back-pressure instead of buffering whole corpora in memory. Completed
+documents are appended to a checkpoint file and skipped on the next run.
+
+    python -m src.ingestion ./pdfs --checkpoint ingest.ckpt --provider ollama -o model_name=nomic-embed-text
+"""
+import argparse
+import contextvars
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.instrumentation import get_tracer
+from src.llm_providers.base import LLMProvider
+from src.llm_providers.embeddings import chunk_ids, document_fingerprint, embed_texts
+from src.pdf_processing.document import as_document
+from src.pdf_processing.processor import PDFProcessor
+from src.pdf_processing.source import PDFInput
+from src.vector_store.qdrant_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def discover_documents(source: str) -> List[Tuple[str, str]]:
+    """Returns (doc_id, path) pairs from a directory of PDFs or a manifest file.
+
+    A manifest is either a JSON list or JSON-lines of {"path": ..., "doc_id": ...} objects,
+    or a plain text file with one path per line. Relative paths resolve against the manifest.
+    """
+    if os.path.isdir(source):
+        documents = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if name.lower().endswith(".pdf"):
+                    path = os.path.join(root, name)
+                    documents.append((os.path.relpath(path, source), path))
+        return sorted(documents)
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        raw = f.read()
+    stripped = raw.lstrip()
+    if stripped.startswith("["):
+        entries: Iterable[Any] = json.loads(raw)
+    else:
+        entries = [json.loads(line) if line.lstrip().startswith("{") else line.strip() for line in raw.splitlines() if line.strip()]
+    documents = []
+    for entry in entries:
+        path = entry["path"] if isinstance(entry, dict) else entry
+        doc_id = entry.get("doc_id", path) if isinstance(entry, dict) else path
+        documents.append((doc_id, path if os.path.isabs(path) else os.path.join(base_dir, path)))
+    return documents
+
+
+class IngestionCheckpoint:
+    """Append-only record of fully stored documents, keyed by doc id and file fingerprint."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._done: Dict[str, str] = {}
+        self._chunks: Dict[str, int] = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a crash mid-write
+                    self._done[entry["doc_id"]] = entry["fingerprint"]
+                    self._chunks[entry["doc_id"]] = entry.get("chunks", 0)
+
+    def is_done(self, doc_id: str, fingerprint: str) -> bool:
+        return self._done.get(doc_id) == fingerprint
+
+    def chunk_count(self, doc_id: str) -> int:
+        """Number of chunks stored for the last recorded version of the document, 0 if unknown."""
+        return self._chunks.get(doc_id, 0)
+
+    def mark_done(self, entries: List[Dict[str, Any]]):
+        if not entries:
+            return
+        for entry in entries:
+            self._done[entry["doc_id"]] = entry["fingerprint"]
+            self._chunks[entry["doc_id"]] = entry["chunks"]
+        if not self.path:
+            return
+        with open(self.path, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _extract_document(pdf_processor: PDFProcessor, doc_id: str, pdf_path: PDFInput) -> Dict[str, Any]:
+    """Extraction stage; runs in a worker process, so it only takes and returns picklable data."""
+    document = as_document(pdf_processor.extract_content(pdf_path))
+    chunks = pdf_processor.semantic_chunking(document)
+    metadata = [{"doc_id": doc_id, "page_number": section.page_number, "heading": section.heading} for section in document.sections]
+    return {"doc_id": doc_id, "chunks": chunks, "metadata": metadata}
+
+
+class _InlineExecutor(Executor):
+    """Runs submitted work synchronously; used when extraction should not spawn processes."""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class BulkIngestor:
+    """Ingests a directory or manifest of PDFs into a VectorStore with checkpointing."""
+
+    def __init__(self, llm_provider: LLMProvider, vector_store: VectorStore, pdf_processor: Optional[PDFProcessor] = None,
+                 checkpoint_path: Optional[str] = None, extract_workers: Optional[int] = None, embed_workers: int = 4,
+                 embed_batch_size: int = 64, upsert_batch_size: int = 256, queue_size: int = 8):
+        self.llm_provider = llm_provider
+        self.vector_store = vector_store
+        self.pdf_processor = pdf_processor or PDFProcessor()
+        self.checkpoint = IngestionCheckpoint(checkpoint_path)
+        self.extract_workers = (os.cpu_count() or 1) if extract_workers is None else extract_workers
+        self.embed_workers = max(1, embed_workers)
+        self.embed_batch_size = embed_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.queue_size = max(1, queue_size)
+
+    def run(self, source: str) -> Dict[str, Any]:
+        """Ingests every pending document from `source` and returns throughput statistics."""
+        documents = discover_documents(source)
+        pending = []
+        for doc_id, path in documents:
+            fingerprint = document_fingerprint(path)
+            if not self.checkpoint.is_done(doc_id, fingerprint):
+                pending.append((doc_id, path, fingerprint))
+
+        stats = {"documents": len(documents), "skipped": len(documents) - len(pending), "ingested": 0, "chunks": 0, "failed": []}
+        start = time.perf_counter()
+        with get_tracer().span("ingestion.run", documents=len(pending)):
+            if pending:
+                self._run_pipeline(pending, stats)
+        elapsed = time.perf_counter() - start
+
+        stats["elapsed_sec"] = elapsed
+        stats["docs_per_min"] = stats["ingested"] / elapsed * 60 if elapsed else 0.0
+        stats["chunks_per_sec"] = stats["chunks"] / elapsed if elapsed else 0.0
+        return stats
+
+    def ingest_document(self, pdf: PDFInput, doc_id: str, fingerprint: str) -> Dict[str, Any]:
+        """Ingests a single document in the calling thread, e.g. an upload handled by a background job.
+
+        Returns {"doc_id", "chunks", "skipped"}; documents already checkpointed with the same
+        fingerprint are skipped.
+        """
+        if self.checkpoint.is_done(doc_id, fingerprint):
+            return {"doc_id": doc_id, "chunks": 0, "skipped": True}
+        stats = {"ingested": 0, "chunks": 0}
+        with get_tracer().span("ingestion.document", doc_id=doc_id):
+            document = _extract_document(self.pdf_processor, doc_id, pdf)
+            document["fingerprint"] = fingerprint
+            document["embeddings"] = embed_texts(self.llm_provider, document["chunks"], self.embed_batch_size)
+            self._flush([document], stats)
+        return {"doc_id": doc_id, "chunks": stats["chunks"], "skipped": False}
+
+    def _run_pipeline(self, pending: List[Tuple[str, str, str]], stats: Dict[str, Any]):
+        extracted: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embedded: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        errors: List[BaseException] = []
+
+        # Each thread runs in its own copy of the context, so its spans nest under ingestion.run
+        # and their token counters roll up to it.
+        producer = threading.Thread(
+            target=contextvars.copy_context().run, args=(self._extract_stage, pending, extracted, stats, errors), daemon=True
+        )
+        embedders = [
+            threading.Thread(target=contextvars.copy_context().run, args=(self._embed_stage, extracted, embedded, stats), daemon=True)
+            for _ in range(self.embed_workers)
+        ]
+        producer.start()
+        for thread in embedders:
+            thread.start()
+        # If the writer fails, the other stages are daemon threads blocked on full queues;
+        # they are abandoned rather than joined and the checkpoint already reflects progress.
+        self._write_stage(embedded, stats)
+        producer.join()
+        for thread in embedders:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def _extract_stage(self, pending, extracted: queue.Queue, stats: Dict[str, Any], errors: List[BaseException]):
+        fingerprints = {doc_id: fingerprint for doc_id, _, fingerprint in pending}
+        # Spawned rather than forked: this runs in a thread of a process that has other threads
+        # (the pipeline's embedders, a web server's pool), and forking those can deadlock.
+        executor = (
+            ProcessPoolExecutor(self.extract_workers, mp_context=multiprocessing.get_context("spawn"))
+            if self.extract_workers > 0 else _InlineExecutor()
+        )
+        try:
+            in_flight: Dict[Future, str] = {}
+            documents = iter(pending)
+            exhausted = False
+            while in_flight or not exhausted:
+                # Keep at most queue_size extractions running so finished documents can't pile up.
+                while not exhausted and len(in_flight) < self.queue_size:
+                    item = next(documents, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    doc_id, path, _ = item
+                    in_flight[executor.submit(_extract_document, self.pdf_processor, doc_id, path)] = doc_id
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    doc_id = in_flight.pop(future)
+                    try:
+                        document = future.result()
+                    except Exception as e:
+                        logger.warning("Extraction failed for %s: %s", doc_id, e)
+                        stats["failed"].append({"doc_id": doc_id, "stage": "extract", "error": str(e)})
+                        continue
+                    document["fingerprint"] = fingerprints[document["doc_id"]]
+                    extracted.put(document)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            executor.shutdown(wait=True)
+            for _ in range(self.embed_workers):
+                extracted.put(_DONE)
+
+    def _embed_stage(self, extracted: queue.Queue, embedded: queue.Queue, stats: Dict[str, Any]):
+        while True:
+            document = extracted.get()
+            if document is _DONE:
+                embedded.put(_DONE)
+                return
+            try:
+                document["embeddings"] = embed_texts(self.llm_provider, document["chunks"], self.embed_batch_size)
+            except Exception as e:
+                logger.warning("Embedding failed for %s: %s", document["doc_id"], e)
+                stats["failed"].append({"doc_id": document["doc_id"], "stage": "embed", "error": str(e)})
+                continue
+            embedded.put(document)
+
+    def _write_stage(self, embedded: queue.Queue, stats: Dict[str, Any]):
+        buffered: List[Dict[str, Any]] = []
+        buffered_chunks = 0
+        finished_embedders = 0
+        while finished_embedders < self.embed_workers:
+            document = embedded.get()
+            if document is _DONE:
+                finished_embedders += 1
+                continue
+            buffered.append(document)
+            buffered_chunks += len(document["chunks"])
+            if buffered_chunks >= self.upsert_batch_size:
+                self._flush(buffered, stats)
+                buffered, buffered_chunks = [], 0
+        self._flush(buffered, stats)
+
+    def _flush(self, documents: List[Dict[str, Any]], stats: Dict[str, Any]):
+        if not documents:
+            return
+        chunks, embeddings, metadata, ids = [], [], [], []
+        for document in documents:
+            chunks.extend(document["chunks"])
+            embeddings.extend(document["embeddings"])
+            metadata.extend(document["metadata"])
+            ids.extend(chunk_ids(document["doc_id"], len(document["chunks"])))
+        self.vector_store.store_embeddings(chunks, embeddings, metadata, ids=ids, batch_size=self.upsert_batch_size)
+        # A changed document that now has fewer chunks leaves its old tail behind; remove it.
+        stale = []
+        for document in documents:
+            previous = self.checkpoint.chunk_count(document["doc_id"])
+            stale.extend(chunk_ids(document["doc_id"], previous)[len(document["chunks"]):])
+        if stale:
+            self.vector_store.delete_points(stale)
+        # Only checkpoint once the points are stored, so a crash re-ingests at most one batch.
+        self.checkpoint.mark_done([
+            {"doc_id": document["doc_id"], "fingerprint": document["fingerprint"], "chunks": len(document["chunks"])}
+            for document in documents
+        ])
+        stats["ingested"] += len(documents)
+        stats["chunks"] += len(chunks)
+
+
+def main(argv: Optional[List[str]] = None):
+    from src.llm_providers.provider_factory import get_llm_provider
+
+    parser = argparse.ArgumentParser(description="Bulk-ingest PDFs into Qdrant.")
+    parser.add_argument("source", help="Directory of PDFs or manifest file.")
+    parser.add_argument("--checkpoint", help="Checkpoint file used to resume interrupted runs.")
+    parser.add_argument("--provider", default="azure_openai", help="LLM provider used for embeddings.")
+    parser.add_argument("-o", "--provider-option", action="append", default=[], metavar="KEY=VALUE",
+                        help="Provider constructor argument; may be repeated.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--collection", default="pdf_chunks")
+    parser.add_argument("--extract-workers", type=int, default=None)
+    parser.add_argument("--embed-workers", type=int, default=4)
+    parser.add_argument("--embed-batch-size", type=int, default=64)
+    parser.add_argument("--upsert-batch-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    provider_options = dict(option.split("=", 1) for option in args.provider_option)
+    ingestor = BulkIngestor(
+        get_llm_provider(args.provider, **provider_options),
+        VectorStore(host=args.host, port=args.port, collection_name=args.collection),
+        checkpoint_path=args.checkpoint,
+        extract_workers=args.extract_workers,
+        embed_workers=args.embed_workers,
+        embed_batch_size=args.embed_batch_size,
+        upsert_batch_size=args.upsert_batch_size,
+    )
+    stats = ingestor.run(args.source)
+    print(
+        f"Ingested {stats['ingested']} of {stats['documents']} documents ({stats['skipped']} already done, "
+        f"{len(stats['failed'])} failed): {stats['chunks']} chunks in {stats['elapsed_sec']:.1f}s, "
+        f"{stats['docs_per_min']:.1f} docs/min, {stats['chunks_per_sec']:.1f} chunks/sec"
+    )
+    for failure in stats["failed"]:
+        print(f"  failed [{failure['stage']}] {failure['doc_id']}: {failure['error']}")
+
+
+if __name__ == "__main__":
+    main()
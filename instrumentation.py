@@ -0,0 +1,263 @@
+import contextvars
+import functools
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+_rollup_lock = threading.Lock()
+
+
+class Span:
+    """A timed unit of work with attributes and counters that roll up to its parent."""
+    __slots__ = ("name", "attributes", "counters", "parent", "start_time_ns", "_start", "duration", "error")
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None, parent: Optional["Span"] = None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.counters: Dict[str, float] = {}
+        self.parent = parent
+        self.start_time_ns = time.time_ns()
+        self._start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def incr(self, key: str, amount: float = 1):
+        with _rollup_lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def _finish(self):
+        self.duration = time.perf_counter() - self._start
+        if self.parent is not None:
+            # Counters (tokens, bytes, cache hits...) accumulate on the enclosing span so that
+            # the outermost span, typically an Agent.run, carries the cost of the whole call.
+            with _rollup_lock:
+                for key, value in self.counters.items():
+                    self.parent.counters[key] = self.parent.counters.get(key, 0) + value
+
+    @property
+    def end_time_ns(self) -> int:
+        return self.start_time_ns + int((self.duration or 0) * 1e9)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "parent": self.parent.name if self.parent else None,
+            "duration": self.duration,
+            "attributes": dict(self.attributes),
+            "counters": dict(self.counters),
+            "error": self.error,
+        }
+
+
+class SpanSink(ABC):
+    """Receives finished spans and metric samples from a Tracer."""
+
+    def on_span_start(self, span: Span):
+        pass
+
+    @abstractmethod
+    def on_span_end(self, span: Span):
+        pass
+
+    def on_metric(self, name: str, value: float, attributes: Dict[str, Any]):
+        pass
+
+
+class InMemorySink(SpanSink):
+    """Keeps spans and metrics in memory, for tests, benchmarks and ad-hoc profiling."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: List[Span] = []
+        self.metrics: List[Dict[str, Any]] = []
+
+    def on_span_end(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def on_metric(self, name: str, value: float, attributes: Dict[str, Any]):
+        with self._lock:
+            self.metrics.append({"name": name, "value": value, "attributes": dict(attributes)})
+
+    def find(self, name: str) -> List[Span]:
+        with self._lock:
+            return [span for span in self.spans if span.name == name]
+
+    def totals(self, name: str, group_by: str = "component") -> Dict[str, Dict[str, float]]:
+        """Sums durations and counters of spans called `name`, grouped by an attribute."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.find(name):
+            group = totals.setdefault(str(span.attributes.get(group_by)), {"calls": 0, "duration": 0.0})
+            group["calls"] += 1
+            group["duration"] += span.duration or 0.0
+            for key, value in span.counters.items():
+                group[key] = group.get(key, 0) + value
+        return totals
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+            self.metrics.clear()
+
+
+class LoggingSink(SpanSink):
+    """Writes one log record per finished span and metric sample."""
+
+    def __init__(self, log: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.log = log or logger
+        self.level = level
+
+    def on_span_end(self, span: Span):
+        fields = {**span.attributes, **span.counters}
+        details = " ".join(f"{key}={value}" for key, value in fields.items())
+        status = f" error={span.error!r}" if span.error else ""
+        self.log.log(self.level, "span %s duration_ms=%.2f %s%s", span.name, (span.duration or 0.0) * 1000, details, status)
+
+    def on_metric(self, name: str, value: float, attributes: Dict[str, Any]):
+        details = " ".join(f"{key}={value}" for key, value in attributes.items())
+        self.log.log(self.level, "metric %s value=%s %s", name, value, details)
+
+
+class OpenTelemetrySink(SpanSink):
+    """Forwards spans and metrics to OpenTelemetry. Requires the `opentelemetry-api` package."""
+
+    def __init__(self, tracer: Any = None, meter: Any = None):
+        from opentelemetry import metrics, trace
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer(__name__)
+        self.meter = meter or metrics.get_meter(__name__)
+        self._open: Dict[int, Any] = {}
+        self._counters: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def on_span_start(self, span: Span):
+        context = None
+        if span.parent is not None:
+            with self._lock:
+                parent = self._open.get(id(span.parent))
+            if parent is not None:
+                context = self._trace.set_span_in_context(parent)
+        otel_span = self.tracer.start_span(span.name, context=context, start_time=span.start_time_ns)
+        with self._lock:
+            self._open[id(span)] = otel_span
+
+    def on_span_end(self, span: Span):
+        with self._lock:
+            otel_span = self._open.pop(id(span), None)
+        if otel_span is None:
+            return
+        for key, value in {**span.attributes, **span.counters}.items():
+            otel_span.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+        if span.error:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=span.end_time_ns)
+
+    def on_metric(self, name: str, value: float, attributes: Dict[str, Any]):
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._counters[name] = self.meter.create_counter(name)
+        counter.add(value, attributes=attributes)
+
+
+class Tracer:
+    """Creates spans and fans them out to the configured sinks."""
+
+    def __init__(self, sinks: Optional[List[SpanSink]] = None):
+        self._sinks: List[SpanSink] = list(sinks or [])
+
+    @property
+    def sinks(self) -> List[SpanSink]:
+        return list(self._sinks)
+
+    def add_sink(self, sink: SpanSink):
+        self._sinks = self._sinks + [sink]
+
+    def remove_sink(self, sink: SpanSink):
+        self._sinks = [s for s in self._sinks if s is not sink]
+
+    def set_sinks(self, sinks: List[SpanSink]):
+        self._sinks = list(sinks)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        span = Span(name, attributes, parent=_current_span.get())
+        sinks = self._sinks
+        for sink in sinks:
+            sink.on_span_start(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span._finish()
+            for sink in sinks:
+                try:
+                    sink.on_span_end(span)
+                except Exception:
+                    logger.exception("Span sink %r failed", sink)
+
+    def metric(self, name: str, value: float = 1, **attributes):
+        for sink in self._sinks:
+            try:
+                sink.on_metric(name, value, attributes)
+            except Exception:
+                logger.exception("Metric sink %r failed", sink)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Returns the process-wide tracer."""
+    return _tracer
+
+
+def configure(*sinks: SpanSink) -> Tracer:
+    """Replaces the sinks of the process-wide tracer; call with no arguments to disable export."""
+    _tracer.set_sinks(list(sinks))
+    return _tracer
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def record(**counters: float):
+    """Adds to counters (e.g. prompt_tokens, bytes_out, cache_hits, retries) on the current span."""
+    span = _current_span.get()
+    if span is None:
+        return
+    for key, value in counters.items():
+        if value and isinstance(value, (int, float)):
+            span.incr(key, value)
+
+
+def annotate(**attributes: Any):
+    """Sets attributes on the current span, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes.update(attributes)
+
+
+def traced(name: str) -> Callable:
+    """Decorates a method so each call runs in a span tagged with the owning class name."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with _tracer.span(name, component=type(self).__name__):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,11 +1,13 @@
+import logging
 import os
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
 from src.llm_providers.provider_factory import get_llm_provider
-from src.pdf_processing.processor import PDFProcessor
-from src.vector_store.qdrant_store import VectorStore
-from src.agents.summarization_agents import DocumentSummaryAgent, SectionSummaryAgent, PageBasedSummaryAgent
-from src.agents.translation_agent import TranslationAgent
-from src.agents.comparison_qa_agent import ComparisonQA Agent
-from src.agents.evaluation_agent import EvaluationAgent
+
+logger = logging.getLogger(__name__)
+
+# LLM provider: "azure_openai" (default), "ollama", or any other registered provider name.
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "azure_openai")
 
 # Configuration (replace with your actual Azure OpenAI details)
 # For a real application, use environment variables or a config file
@@ -14,32 +16,79 @@ AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT", "YOUR_AZURE_OPENAI_EN
 AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01")
 AZURE_OPENAI_DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "YOUR_AZURE_OPENAI_DEPLOYMENT_NAME")
 AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME", "YOUR_AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME")
-
-# Initialize LLM Provider
-llm_provider = get_llm_provider(
-    "azure_openai",
-    api_key=AZURE_OPENAI_API_KEY,
-    azure_endpoint=AZURE_OPENAI_ENDPOINT,
-    api_version=AZURE_OPENAI_API_VERSION,
-    deployment_name=AZURE_OPENAI_DEPLOYMENT_NAME # For chat completions
-)
-
-# Initialize PDF Processor and Vector Store
-pdf_processor = PDFProcessor()
-vector_store = VectorStore()
-
-# Initialize Agents
-document_summary_agent = DocumentSummaryAgent(llm_provider=llm_provider, pdf_processor=pdf_processor)
-section_summary_agent = SectionSummaryAgent(llm_provider=llm_provider, pdf_processor=pdf_processor)
-page_based_summary_agent = PageBasedSummaryAgent(llm_provider=llm_provider, pdf_processor=pdf_processor)
-translation_agent = TranslationAgent(llm_provider=llm_provider, pdf_processor=pdf_processor)
-comparison_qa_agent = ComparisonQAAgent(llm_provider=llm_provider, pdf_processor=pdf_processor, vector_store=vector_store)
-evaluation_agent = EvaluationAgent(llm_provider=llm_provider, pdf_processor=pdf_processor)
+# Reduced embedding size for text-embedding-3 deployments (e.g. 256); unset keeps the model's full size.
+# With Ollama, set it to the embedding model's size (e.g. 768 for nomic-embed-text).
+EMBEDDING_DIMENSIONS = int(os.environ["EMBEDDING_DIMENSIONS"]) if os.getenv("EMBEDDING_DIMENSIONS") else None
+
+# Ollama: the chat and embedding models default to OLLAMA_MODEL. OLLAMA_KEEP_ALIVE is how long
+# models stay loaded after a request, e.g. "30m" or -1 for forever; unset keeps the server default.
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama2")
+OLLAMA_CHAT_MODEL = os.getenv("OLLAMA_CHAT_MODEL")
+OLLAMA_EMBEDDING_MODEL = os.getenv("OLLAMA_EMBEDDING_MODEL")
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE")
+
+def _keep_alive(value: Optional[str]) -> Optional[Union[str, int]]:
+    # Ollama takes a duration string or a number of seconds.
+    return int(value) if value and value.lstrip("-").isdigit() else value
+
+def _provider_settings(provider_name: str) -> Dict[str, Any]:
+    if provider_name == "azure_openai":
+        return {
+            "api_key": AZURE_OPENAI_API_KEY,
+            "azure_endpoint": AZURE_OPENAI_ENDPOINT,
+            "api_version": AZURE_OPENAI_API_VERSION,
+            "deployment_name": AZURE_OPENAI_DEPLOYMENT_NAME, # For chat completions
+            "embedding_dimensions": EMBEDDING_DIMENSIONS,
+        }
+    if provider_name == "ollama":
+        return {
+            "base_url": OLLAMA_BASE_URL,
+            "model_name": OLLAMA_MODEL,
+            "chat_model": OLLAMA_CHAT_MODEL,
+            "embedding_model": OLLAMA_EMBEDDING_MODEL,
+            "keep_alive": _keep_alive(OLLAMA_KEEP_ALIVE),
+        }
+    return {}
+
+@lru_cache(maxsize=1)
+def get_agents() -> Dict[str, Any]:
+    """Builds the provider, stores and agents on first call, so importing this module stays cheap."""
+    # Imported here: the agents pull in pypdf, qdrant-client and numpy, which cost about a second.
+    from src.pdf_processing.processor import PDFProcessor
+    from src.vector_store.qdrant_store import VectorStore
+    from src.agents.summarization_agents import DocumentSummaryAgent, SectionSummaryAgent, PageBasedSummaryAgent
+    from src.agents.translation_agent import TranslationAgent
+    from src.agents.comparison_qa_agent import ComparisonQAAgent
+    from src.agents.evaluation_agent import EvaluationAgent
+
+    llm_provider = get_llm_provider(LLM_PROVIDER, **_provider_settings(LLM_PROVIDER))
+
+    # Load local models now rather than on the first request (Ollama)
+    warm_up = getattr(llm_provider, "warm_up", None)
+    if warm_up is not None:
+        try:
+            warm_up()
+        except Exception:
+            logger.warning("Model warm-up failed; models will load on the first request", exc_info=True)
+
+    # PDF Processor and Vector Store (the store connects to Qdrant lazily on first use)
+    pdf_processor = PDFProcessor(remove_boilerplate=True)
+    vector_store = VectorStore(vector_size=EMBEDDING_DIMENSIONS or 1536)
+
+    return {
+        "document_summary": DocumentSummaryAgent(llm_provider=llm_provider, pdf_processor=pdf_processor),
+        "section_summary": SectionSummaryAgent(llm_provider=llm_provider, pdf_processor=pdf_processor),
+        "page_based_summary": PageBasedSummaryAgent(llm_provider=llm_provider, pdf_processor=pdf_processor),
+        "translation": TranslationAgent(llm_provider=llm_provider, pdf_processor=pdf_processor),
+        "comparison_qa": ComparisonQAAgent(llm_provider=llm_provider, pdf_processor=pdf_processor, vector_store=vector_store),
+        "evaluation": EvaluationAgent(llm_provider=llm_provider, pdf_processor=pdf_processor),
+    }
 
 def main():
     print("PDF Intelligence System - Agent Demonstration")
     print("Please ensure you have a PDF file named 'sample.pdf' in the root directory for testing.")
-    print("Also, ensure your Azure OpenAI environment variables are set or replace placeholders in main.py.")
+    print("Also, ensure your Azure OpenAI environment variables are set, or set LLM_PROVIDER=ollama and the OLLAMA_* variables.")
 
     sample_pdf_path = "sample.pdf"
 
@@ -47,25 +96,27 @@ def main():
         print(f"Error: {sample_pdf_path} not found. Please create one for testing.")
         return
 
+    agents = get_agents()
+
     # --- Demonstrate Document Summary Agent ---
     print("\n--- Document Summary ---")
-    doc_summary = document_summary_agent.run(sample_pdf_path)
+    doc_summary = agents["document_summary"].run(sample_pdf_path)
     print(f"Document Summary: {doc_summary}")
 
     # --- Demonstrate Section Summary Agent ---
     print("\n--- Section Summary (assuming a section heading 'Introduction') ---")
     # This requires a known section heading from your PDF. Adjust as needed.
-    section_summary = section_summary_agent.run(sample_pdf_path, "Introduction")
+    section_summary = agents["section_summary"].run(sample_pdf_path, "Introduction")
     print(f"Section Summary: {section_summary}")
 
     # --- Demonstrate Page-based Summary Agent ---
     print("\n--- Page-based Summary (Page 1) ---")
-    page_summary = page_based_summary_agent.run(sample_pdf_path, [1])
+    page_summary = agents["page_based_summary"].run(sample_pdf_path, [1])
     print(f"Page Summary: {page_summary}")
 
     # --- Demonstrate Translation Agent ---
     print("\n--- Translation (to Spanish) ---")
-    translated_content = translation_agent.run(sample_pdf_path, "Spanish")
+    translated_content = agents["translation"].run(sample_pdf_path, "Spanish")
     print(f"Translated Content (first page): {translated_content['translated_content'][0]['translated_sections'][0]['translated_text'][:200]}...")
 
     # --- Demonstrate Comparison + QA Chatbot Agent ---
@@ -73,7 +124,7 @@ def main():
     print("Please ensure you have 'sample2.pdf' for comparison testing.")
     sample_pdf2_path = "sample2.pdf"
     if os.path.exists(sample_pdf2_path):
-        qa_response = comparison_qa_agent.run(sample_pdf_path, sample_pdf2_path, "What is the main topic of the documents?")
+        qa_response = agents["comparison_qa"].run(sample_pdf_path, sample_pdf2_path, "What is the main topic of the documents?")
         print(f"QA Answer: {qa_response['answer']}")
         print(f"References: {qa_response['references']}")
     else:
@@ -81,7 +132,7 @@ def main():
 
     # --- Demonstrate Evaluation Agent ---
     print("\n--- Evaluation Agent ---")
-    evaluation_report = evaluation_agent.run(sample_pdf_path, num_questions=2)
+    evaluation_report = agents["evaluation"].run(sample_pdf_path, num_questions=2)
     print(f"Generated Questions: {evaluation_report['questions_generated']}")
     print(f"Overall Assessment: {evaluation_report['overall_assessment']}")
 
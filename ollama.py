@@ -1,39 +1,75 @@
 
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 import requests
 
 from .base import LLMProvider
+from src.instrumentation import traced, record, annotate
 
 class OllamaProvider(LLMProvider):
     """Ollama LLM provider implementation."""
     base_url: str
     model_name: str
+    # Chat and embeddings can use different models; both default to model_name.
+    chat_model: Optional[str] = None
+    embedding_model: Optional[str] = None
+    # How long Ollama keeps a model loaded after a request, e.g. "30m", 3600 or -1 for
+    # forever; None leaves the server default (5 minutes).
+    keep_alive: Optional[Union[str, int]] = None
+    timeout: float = 300.0
+
+    def __init__(self, base_url: str = "http://localhost:11434", model_name: str = "llama2", chat_model: Optional[str] = None,
+                 embedding_model: Optional[str] = None, keep_alive: Optional[Union[str, int]] = None, timeout: float = 300.0):
+        super().__init__(base_url=base_url, model_name=model_name, chat_model=chat_model or model_name,
+                         embedding_model=embedding_model or model_name, keep_alive=keep_alive, timeout=timeout)
 
-    def __init__(self, base_url: str = "http://localhost:11434", model_name: str = "llama2"):
-        super().__init__(base_url=base_url, model_name=model_name)
-        
         # Ensure the base_url has a protocol
         if not (self.base_url.startswith("http://") or self.base_url.startswith("https://")):
             self.base_url = "http://" + self.base_url # Ollama typically runs on http
 
-    def generate_text(self, prompt: str, **kwargs) -> str:
-        url = f"{self.base_url}/api/generate"
-        payload = {"model": self.model_name, "prompt": prompt, **kwargs}
-        response = requests.post(url, json=payload)
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.keep_alive is not None:
+            payload.setdefault("keep_alive", self.keep_alive)
+        response = requests.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
         response.raise_for_status()
-        # Ollama's API returns a stream of JSON objects, we need to parse them
-        # For simplicity, we'll assume a single response for now.
-        # In a real application, you'd iterate through response.iter_lines()
-        return response.json()["response"]
+        return response.json()
+
+    @traced("llm.generate_text")
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        body = self._post("/api/generate", {"model": self.chat_model, "prompt": prompt, "stream": False, **kwargs})
+        record(
+            prompt_tokens=body.get("prompt_eval_count", 0),
+            completion_tokens=body.get("eval_count", 0),
+            bytes_in=len(prompt.encode("utf-8")),
+            bytes_out=len(body["response"].encode("utf-8")),
+        )
+        return body["response"]
 
+    @traced("llm.generate_embedding")
     def generate_embedding(self, text: str) -> List[float]:
-        url = f"{self.base_url}/api/embeddings"
-        payload = {"model": self.model_name, "prompt": text}
-        response = requests.post(url, json=payload)
-        response.raise_for_status()
-        return response.json()["embedding"]
+        body = self._post("/api/embed", {"model": self.embedding_model, "input": text})
+        record(prompt_tokens=body.get("prompt_eval_count", 0), bytes_in=len(text.encode("utf-8")))
+        return body["embeddings"][0]
 
-    def get_model_name(self) -> str:
-        return self.model_name
+    @traced("llm.generate_embeddings")
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        body = self._post("/api/embed", {"model": self.embedding_model, "input": texts})
+        record(prompt_tokens=body.get("prompt_eval_count", 0), bytes_in=sum(len(t.encode("utf-8")) for t in texts))
+        return body["embeddings"]
 
+    @traced("llm.warm_up")
+    def warm_up(self) -> Dict[str, float]:
+        """Loads the chat and embedding models so the first real request doesn't pay for it.
 
+        Returns the load time Ollama reported for each model in seconds; 0 when it was
+        already loaded.
+        """
+        # A generate request without a prompt only loads the model.
+        loads = {self.chat_model: self._post("/api/generate", {"model": self.chat_model, "stream": False}).get("load_duration", 0) / 1e9}
+        if self.embedding_model != self.chat_model:
+            body = self._post("/api/embed", {"model": self.embedding_model, "input": "warm-up"})
+            loads[self.embedding_model] = body.get("load_duration", 0) / 1e9
+        annotate(**{f"load_sec.{model}": seconds for model, seconds in loads.items()})
+        return loads
+
+    def get_model_name(self) -> str:
+        return self.chat_model
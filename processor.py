@@ -1,40 +1,57 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 from pypdf import PdfReader
 
+from src.instrumentation import traced, record, annotate
+from .boilerplate import BoilerplateFilter
+from .document import Document, as_document
+from .source import PDFInput, PDFSource
+
 class PDFProcessor:
     """Handles PDF content extraction and chunking."""
 
-    def extract_content(self, pdf_path: str) -> List[Dict[str, Any]]:
-        """Extracts content from PDF without OCR, preserving sections, headings, and tables."""
-        reader = PdfReader(pdf_path)
-        content = []
-        for page_num, page in enumerate(reader.pages):
-            text = page.extract_text()
-            # This is a simplified extraction. Real-world scenario needs advanced parsing
-            # to identify headings, paragraphs, and tables accurately.
-            # For now, we'll treat each page as a section.
-            content.append({
-                "page_number": page_num + 1,
-                "text": text,
-                "sections": [
-                    {
-                        "heading": f"Page {page_num + 1}",
-                        "paragraphs": [p.strip() for p in text.split('\n\n') if p.strip()],
-                        "tables": [] # pypdf doesn't directly extract structured tables easily
-                    }
-                ]
-            })
+    def __init__(self, remove_boilerplate: bool = False, boilerplate_filter: Optional[BoilerplateFilter] = None):
+        # Boilerplate removal strips running headers, footers, page numbers and repeated legal
+        # notices from page text and paragraphs, so they are neither embedded nor prompted.
+        self.remove_boilerplate = remove_boilerplate
+        self.boilerplate_filter = boilerplate_filter or BoilerplateFilter()
+
+    @traced("pdf.extract")
+    def extract_content(self, pdf_path: PDFInput) -> Document:
+        """Extracts content from PDF without OCR, preserving sections, headings, and tables.
+
+        `pdf_path` may also be bytes, a memoryview, a file object or a PDFSource; none of
+        them are copied or written to disk first. Pages of the returned Document can also be
+        read like the former page dicts (page["text"], page["sections"], ...). With boilerplate
+        removal enabled, its report is available as `boilerplate_report` on the Document.
+        """
+        source = PDFSource.from_input(pdf_path)
+        record(bytes_in=source.nbytes or 0)
+        try:
+            with source.open() as stream:
+                reader = PdfReader(stream)
+                page_texts = [page.extract_text() for page in reader.pages]
+        finally:
+            if source is not pdf_path:
+                source.close()
+        report = None
+        if self.remove_boilerplate:
+            page_texts, report = self.boilerplate_filter.clean(page_texts)
+            record(boilerplate_lines_removed=report["removed_lines"], boilerplate_tokens_saved=report["tokens_saved"])
+        # This is a simplified extraction. Real-world scenario needs advanced parsing
+        # to identify headings, paragraphs, and tables accurately.
+        # For now, we'll treat each page as a section.
+        content = Document.from_page_texts(page_texts, boilerplate_report=report)
+        record(bytes_out=sum(len(text.encode("utf-8")) for text in page_texts))
+        annotate(pages=len(content))
         return content
 
-    def semantic_chunking(self, extracted_content: List[Dict[str, Any]]) -> List[str]:
+    @traced("pdf.chunk")
+    def semantic_chunking(self, extracted_content: Union[Document, List[Dict[str, Any]]]) -> List[str]:
         """Performs semantic chunking of the extracted data suitable for embedding."""
         chunks = []
-        for page_content in extracted_content:
-            for section in page_content["sections"]:
-                # Combine heading and paragraphs for chunking
-                chunk_text = f"{section['heading']}\n" + "\n".join(section["paragraphs"])
-                chunks.append(chunk_text)
-                # In a more advanced scenario, tables would also be processed and chunked
+        for section in as_document(extracted_content).sections:
+            # Combine heading and paragraphs for chunking
+            chunks.append(section.text)
+            # In a more advanced scenario, tables would also be processed and chunked
+        annotate(chunks=len(chunks))
         return chunks
-
-
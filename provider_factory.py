@@ -1,17 +1,44 @@
-from .azure_openai import AzureOpenAIProvider
-from .ollama import OllamaProvider
-from .gemini import GeminiProvider
+import importlib
+from importlib import metadata
+from typing import Dict, List, Type, Union
+
 from .base import LLMProvider
 
-def get_llm_provider(provider_name: str, **kwargs) -> LLMProvider:
-    """Factory function to get an LLM provider instance."""
-    if provider_name == "azure_openai":
-        return AzureOpenAIProvider(**kwargs)
-    elif provider_name == "ollama":
-        return OllamaProvider(**kwargs)
-    elif provider_name == "gemini":
-        return GeminiProvider(**kwargs)
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider_name}")
+# Entry-point group third-party packages can use to plug in additional providers.
+ENTRY_POINT_GROUP = "pdf_intelligence.llm_providers"
+
+# Providers are referenced as "module:Class" and only imported when requested, so that
+# importing this module never pulls in openai, google.generativeai or requests.
+_PROVIDERS: Dict[str, Union[str, Type[LLMProvider]]] = {
+    "azure_openai": ".azure_openai:AzureOpenAIProvider",
+    "ollama": ".ollama:OllamaProvider",
+    "gemini": ".gemini:GeminiProvider",
+    "fake": ".fake:FakeLLMProvider",
+}
 
+def register_provider(provider_name: str, provider: Union[str, Type[LLMProvider]]):
+    """Registers a provider class, or a lazy "package.module:Class" reference to one."""
+    _PROVIDERS[provider_name] = provider
 
+def available_providers() -> List[str]:
+    """Names of the built-in, registered and entry-point providers."""
+    names = set(_PROVIDERS)
+    names.update(entry_point.name for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP))
+    return sorted(names)
+
+def _load_provider_class(provider_name: str) -> Type[LLMProvider]:
+    provider = _PROVIDERS.get(provider_name)
+    if provider is None:
+        for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name == provider_name:
+                return entry_point.load()
+        raise ValueError(f"Unknown LLM provider: {provider_name}")
+    if not isinstance(provider, str):
+        return provider
+    module_name, _, class_name = provider.partition(":")
+    module = importlib.import_module(module_name, package=__package__)
+    return getattr(module, class_name)
+
+def get_llm_provider(provider_name: str, **kwargs) -> LLMProvider:
+    """Factory function to get an LLM provider instance."""
+    return _load_provider_class(provider_name)(**kwargs)
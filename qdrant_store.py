@@ -1,47 +1,176 @@
+import os
+import threading
 from qdrant_client import QdrantClient, models
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Union
+
+from src.instrumentation import traced, annotate
+from .reduction import EmbeddingReducer
+
+def _doc_filter(doc_ids: Iterable[str]) -> models.Filter:
+    return models.Filter(must=[models.FieldCondition(key="doc_id", match=models.MatchAny(any=list(doc_ids)))])
 
 class VectorStore:
     """Handles embedding storage and retrieval using Qdrant."""
 
-    def __init__(self, host: str = "localhost", port: int = 6333, collection_name: str = "pdf_chunks", client: Optional[QdrantClient] = None):
-        self.client = client if client else QdrantClient(host=host, port=port)
+    def __init__(self, host: str = "localhost", port: int = 6333, collection_name: str = "pdf_chunks", client: Optional[QdrantClient] = None,
+                 vector_size: int = 1536, reducer: Optional[EmbeddingReducer] = None, reducer_path: Optional[str] = None):
+        # Nothing talks to Qdrant until the store is first used, so constructing a
+        # VectorStore at import or startup time is free.
+        self.host = host
+        self.port = port
+        self._client = client
         self.collection_name = collection_name
-        self._create_collection_if_not_exists()
+        # With a reducer, embeddings are reduced client-side to reducer.output_dimension before
+        # they are stored or searched. A reducer that needs training data (PCA) must be fitted
+        # with fit_reducer() or loaded from `reducer_path`; others are fitted on first use.
+        # Fitted reducers are saved to `reducer_path`, from which later stores on the same
+        # collection load them.
+        self.reducer = reducer
+        self.reducer_path = reducer_path
+        if (reducer is None or not reducer.is_fitted) and reducer_path and os.path.exists(reducer_path):
+            self.reducer = EmbeddingReducer.load(reducer_path)
+            if reducer is not None and (self.reducer.kind, self.reducer.output_dimension) != (reducer.kind, reducer.output_dimension):
+                raise ValueError(
+                    f"Reducer saved at {reducer_path} is {self.reducer.kind} to {self.reducer.output_dimension} dimensions, "
+                    f"but {reducer.kind} to {reducer.output_dimension} dimensions was requested"
+                )
+        self.vector_size = self.reducer.output_dimension if self.reducer else vector_size
+        self._collection_ready = False
+        self._lock = threading.RLock()
+
+    @property
+    def client(self) -> QdrantClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = QdrantClient(host=self.host, port=self.port)
+        return self._client
 
+    def _ensure_collection(self):
+        if self._collection_ready:
+            return
+        with self._lock:
+            if not self._collection_ready:
+                self._create_collection_if_not_exists()
+                self._collection_ready = True
+
+    @traced("vector_store.ensure_collection")
     def _create_collection_if_not_exists(self):
         collections = self.client.get_collections().collections
         if self.collection_name not in [c.name for c in collections]:
             self.client.recreate_collection(
                 collection_name=self.collection_name,
-                vectors_config=models.VectorParams(size=1536, distance=models.Distance.COSINE), # Assuming OpenAI embedding size
+                vectors_config=models.VectorParams(size=self.vector_size, distance=models.Distance.COSINE),
+            )
+            return
+        # An existing collection must match, e.g. one created with reduced vectors can't be
+        # reused without the reducer; Qdrant would only fail later on the first upsert or search.
+        size = self.client.get_collection(self.collection_name).config.params.vectors.size
+        if size != self.vector_size:
+            raise ValueError(
+                f"Collection {self.collection_name} holds {size}-dimensional vectors, but this store uses {self.vector_size}"
             )
 
-    def store_embeddings(self, chunks: List[str], embeddings: List[List[float]], metadata: List[Dict[str, Any]] = None):
-        """Stores chunks and their embeddings in Qdrant."""
+    def fit_reducer(self, embeddings: List[List[float]], refit: bool = False):
+        """Fits the reducer on a sample of embeddings and saves it next to the collection.
+
+        A fitted reducer is only replaced with `refit=True`, since vectors already stored with
+        it are not comparable with queries reduced by the new one.
+        """
+        if self.reducer is None:
+            raise RuntimeError("This VectorStore has no reducer to fit; pass one as `reducer`")
+        with self._lock:
+            if self.reducer.is_fitted and not refit:
+                raise RuntimeError(f"{type(self.reducer).__name__} is already fitted; pass refit=True to replace it")
+            self._fit_reducer(embeddings)
+
+    def _fit_reducer(self, embeddings: List[List[float]]):
+        self.reducer.fit(embeddings)
+        if self.reducer_path:
+            self.reducer.save(self.reducer_path)
+
+    def _reduce(self, embeddings: List[List[float]]) -> List[List[float]]:
+        if self.reducer is None or not embeddings:
+            return embeddings
+        if not self.reducer.is_fitted:
+            with self._lock:
+                # Checked again under the lock: another thread may have fitted it meanwhile.
+                if not self.reducer.is_fitted:
+                    if self.reducer.needs_training_data:
+                        raise RuntimeError(
+                            f"{type(self.reducer).__name__} is not fitted: call fit_reducer() with a sample of at least "
+                            f"{self.reducer.output_dimension} embeddings, or pass the reducer_path it was saved to"
+                        )
+                    self._fit_reducer(embeddings)
+        return self.reducer.transform(embeddings).tolist()
+
+    @traced("vector_store.upsert")
+    def store_embeddings(self, chunks: List[str], embeddings: List[List[float]], metadata: List[Dict[str, Any]] = None,
+                         ids: Optional[List[Union[int, str]]] = None, batch_size: int = 256):
+        """Stores chunks and their embeddings in Qdrant, upserting `batch_size` points per request.
+
+        `ids` defaults to the chunk positions; pass stable ids (e.g. UUIDs) when storing several documents.
+        """
+        self._ensure_collection()
+        embeddings = self._reduce(embeddings)
         points = []
         for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
             payload = metadata[i] if metadata else {}
             payload["text"] = chunk # Store the original text chunk as well
             points.append(
                 models.PointStruct(
-                    id=i, # Simple ID for now, consider UUIDs for production
+                    id=ids[i] if ids else i,
                     vector=embedding,
                     payload=payload
                 )
             )
-        self.client.upsert(collection_name=self.collection_name, points=points)
+        annotate(points=len(points))
+        for start in range(0, len(points), batch_size):
+            self.client.upsert(collection_name=self.collection_name, points=points[start:start + batch_size])
+
+    @traced("vector_store.delete")
+    def delete_points(self, ids: List[Union[int, str]]):
+        """Deletes points by id."""
+        self._ensure_collection()
+        self.client.delete(collection_name=self.collection_name, points_selector=models.PointIdsList(points=list(ids)))
+        annotate(points=len(ids))
 
-    def retrieve_similar(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
-        """Retrieves similar chunks based on a query embedding."""
+    @traced("vector_store.delete_documents")
+    def delete_documents(self, doc_ids: Iterable[str]):
+        """Deletes all points whose "doc_id" payload is one of `doc_ids`."""
+        self._ensure_collection()
+        self.client.delete(collection_name=self.collection_name, points_selector=models.FilterSelector(filter=_doc_filter(doc_ids)))
+
+    @traced("vector_store.search")
+    def retrieve_similar(self, query_embedding: List[float], top_k: int = 5, doc_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Retrieves similar chunks based on a query embedding, only from `doc_ids` if given."""
+        self._ensure_collection()
+        search_kwargs = {"query_filter": _doc_filter(doc_ids)} if doc_ids is not None else {}
         search_result = self.client.search(
             collection_name=self.collection_name,
-            query_vector=query_embedding,
-            limit=top_k
+            query_vector=self._reduce([query_embedding])[0],
+            limit=top_k,
+            **search_kwargs
         )
         results = []
         for hit in search_result:
             results.append({"text": hit.payload["text"], "score": hit.score, "metadata": hit.payload})
+        annotate(top_k=top_k, results=len(results))
         return results
 
-
+    @traced("vector_store.search_batch")
+    def retrieve_similar_batch(self, query_embeddings: List[List[float]], top_k: int = 5,
+                               doc_ids: Optional[Iterable[str]] = None) -> List[List[Dict[str, Any]]]:
+        """Retrieves similar chunks for several query embeddings in a single Qdrant round trip, only from `doc_ids` if given."""
+        self._ensure_collection()
+        query_filter = _doc_filter(doc_ids) if doc_ids is not None else None
+        requests = [
+            models.SearchRequest(vector=embedding, limit=top_k, with_payload=True, filter=query_filter)
+            for embedding in self._reduce(query_embeddings)
+        ]
+        batch_result = self.client.search_batch(collection_name=self.collection_name, requests=requests)
+        results = []
+        for search_result in batch_result:
+            results.append([{"text": hit.payload["text"], "score": hit.score, "metadata": hit.payload} for hit in search_result])
+        annotate(queries=len(requests), top_k=top_k)
+        return results
@@ -0,0 +1,126 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+
+import numpy as np
+
+class EmbeddingReducer(ABC):
+    """Maps embeddings to `output_dimension` dimensions before they are stored or searched.
+
+    For providers without native reduced-dimension embeddings (Ollama, Gemini). Reducers are
+    saved next to the collection they were used for, since stored vectors are only comparable
+    with queries reduced the same way.
+    """
+    kind: str = ""
+    # Whether fit() needs a representative sample. Reducers that don't are fitted by the
+    # VectorStore on first use; the others must be fitted or loaded beforehand.
+    needs_training_data: bool = True
+
+    def __init__(self, output_dimension: int):
+        if output_dimension <= 0:
+            raise ValueError("output_dimension must be positive")
+        self.output_dimension = output_dimension
+        self.input_dimension: Optional[int] = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.input_dimension is not None
+
+    @abstractmethod
+    def fit(self, embeddings: Sequence[Sequence[float]]) -> "EmbeddingReducer":
+        ...
+
+    @abstractmethod
+    def _project(self, matrix: np.ndarray) -> np.ndarray:
+        ...
+
+    def transform(self, embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+        """Returns the reduced embeddings as a (n, output_dimension) float32 array."""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if not self.is_fitted:
+            raise RuntimeError(f"{type(self).__name__} must be fitted before use")
+        if matrix.ndim != 2 or matrix.shape[1] != self.input_dimension:
+            raise ValueError(f"Expected embeddings of dimension {self.input_dimension}, got shape {matrix.shape}")
+        return self._project(matrix).astype(np.float32)
+
+    @abstractmethod
+    def _arrays(self) -> dict:
+        ...
+
+    @abstractmethod
+    def _restore(self, data):
+        ...
+
+    def save(self, path: str):
+        if not self.is_fitted:
+            raise RuntimeError(f"{type(self).__name__} must be fitted before it is saved")
+        with open(path, "wb") as f:
+            np.savez(f, kind=self.kind, output_dimension=self.output_dimension, **self._arrays())
+
+    @classmethod
+    def load(cls, path: str) -> "EmbeddingReducer":
+        with np.load(path) as data:
+            kind = str(data["kind"])
+            reducer_class = {c.kind: c for c in (PCAReducer, RandomProjectionReducer)}.get(kind)
+            if reducer_class is None:
+                raise ValueError(f"Unknown reducer kind: {kind}")
+            reducer = reducer_class(int(data["output_dimension"]))
+            reducer._restore(data)
+        return reducer
+
+class PCAReducer(EmbeddingReducer):
+    """Projects embeddings onto their top principal components, fitted on a sample of the corpus."""
+    kind = "pca"
+
+    def __init__(self, output_dimension: int):
+        super().__init__(output_dimension)
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+
+    def fit(self, embeddings: Sequence[Sequence[float]]) -> "PCAReducer":
+        matrix = np.asarray(embeddings, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[0] < self.output_dimension:
+            raise ValueError(f"PCA to {self.output_dimension} dimensions needs at least {self.output_dimension} sample embeddings")
+        mean = matrix.mean(axis=0)
+        # Rows of vt are the principal directions, ordered by explained variance.
+        _, _, vt = np.linalg.svd(matrix - mean, full_matrices=False)
+        self.mean = mean.astype(np.float32)
+        self.components = vt[:self.output_dimension].astype(np.float32)
+        self.input_dimension = matrix.shape[1]
+        return self
+
+    def _project(self, matrix: np.ndarray) -> np.ndarray:
+        return (matrix - self.mean) @ self.components.T
+
+    def _arrays(self) -> dict:
+        return {"mean": self.mean, "components": self.components}
+
+    def _restore(self, data):
+        self.mean, self.components = data["mean"], data["components"]
+        self.input_dimension = self.components.shape[1]
+
+class RandomProjectionReducer(EmbeddingReducer):
+    """Gaussian random projection. Needs no training data, only the input dimension."""
+    kind = "random_projection"
+    needs_training_data = False
+
+    def __init__(self, output_dimension: int, seed: int = 0):
+        super().__init__(output_dimension)
+        self.seed = seed
+        self.matrix: Optional[np.ndarray] = None
+
+    def fit(self, embeddings: Sequence[Sequence[float]]) -> "RandomProjectionReducer":
+        input_dimension = len(embeddings[0])
+        rng = np.random.default_rng(self.seed)
+        self.matrix = (rng.standard_normal((input_dimension, self.output_dimension)) / np.sqrt(self.output_dimension)).astype(np.float32)
+        self.input_dimension = input_dimension
+        return self
+
+    def _project(self, matrix: np.ndarray) -> np.ndarray:
+        return matrix @ self.matrix
+
+    def _arrays(self) -> dict:
+        return {"matrix": self.matrix}
+
+    def _restore(self, data):
+        self.matrix = data["matrix"]
+        self.input_dimension = self.matrix.shape[0]
@@ -0,0 +1,168 @@
+import io
+import mmap
+import os
+from typing import BinaryIO, Optional, Union
+
+# Files at least this large are memory-mapped instead of read through a buffered file object.
+MMAP_THRESHOLD = 1 << 20
+
+class MemoryViewStream(io.RawIOBase):
+    """Read-only, seekable file object over a buffer, without copying the buffer."""
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        size = min(len(b), len(self._view) - self._position)
+        if size <= 0:
+            return 0
+        b[:size] = self._view[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._position + size)
+        data = self._view[self._position:end].tobytes()
+        self._position = max(self._position, end)
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+class _FileWindow(io.RawIOBase):
+    """Delegates to a caller-owned file object and rewinds it on close instead of closing it."""
+
+    def __init__(self, file: BinaryIO, start: int):
+        super().__init__()
+        self._file = file
+        self._start = start
+        file.seek(start)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self._file.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            offset += self._start
+        return self._file.seek(offset, whence) - self._start
+
+    def tell(self) -> int:
+        return self._file.tell() - self._start
+
+    def close(self):
+        if not self.closed:
+            self._file.seek(self._start)
+        super().close()
+
+class PDFSource:
+    """A PDF given as a path, bytes-like buffer or file object, which can be opened any number
+    of times without being copied, so one upload can be shared by several agents in a request.
+
+    Buffers are read through a zero-copy MemoryViewStream, large files are memory-mapped and
+    caller-owned file objects are read in place and rewound afterwards.
+    """
+
+    def __init__(self, path: Optional[Union[str, os.PathLike]] = None, data=None, file: Optional[BinaryIO] = None,
+                 mmap_threshold: int = MMAP_THRESHOLD):
+        if sum(x is not None for x in (path, data, file)) != 1:
+            raise ValueError("PDFSource needs exactly one of path, data or file")
+        self.path = path
+        self.data = data
+        self.file = file
+        self.mmap_threshold = mmap_threshold
+        self._mmap: Optional[mmap.mmap] = None
+        self._file_start = 0
+        if file is not None:
+            getbuffer = getattr(file, "getbuffer", None)
+            if getbuffer is not None:
+                # BytesIO: share its buffer rather than reading through it.
+                self.data, self.file = getbuffer(), None
+            elif file.seekable():
+                self._file_start = file.tell()
+            else:
+                self.data, self.file = file.read(), None
+
+    @classmethod
+    def from_input(cls, pdf: "PDFInput") -> "PDFSource":
+        if isinstance(pdf, PDFSource):
+            return pdf
+        if isinstance(pdf, (str, os.PathLike)):
+            return cls(path=pdf)
+        if isinstance(pdf, (bytes, bytearray, memoryview)):
+            return cls(data=pdf)
+        if hasattr(pdf, "read"):
+            return cls(file=pdf)
+        raise TypeError(f"Unsupported PDF input: {type(pdf).__name__}")
+
+    @property
+    def nbytes(self) -> Optional[int]:
+        if self.data is not None:
+            return memoryview(self.data).nbytes
+        if self.path is not None:
+            return os.path.getsize(self.path)
+        return None
+
+    def open(self) -> BinaryIO:
+        """Returns a fresh binary stream positioned at the start of the PDF; close it when done."""
+        if self.data is not None:
+            return MemoryViewStream(self.data)
+        if self.file is not None:
+            return _FileWindow(self.file, self._file_start)
+        if os.path.getsize(self.path) >= self.mmap_threshold:
+            if self._mmap is None:
+                with open(self.path, "rb") as f:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return MemoryViewStream(self._mmap)
+        return open(self.path, "rb")
+
+    def close(self):
+        """Releases the memory map, if any. Streams returned by open() must be closed first."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "PDFSource":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+PDFInput = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO, PDFSource]
@@ -2,8 +2,11 @@ from typing import List, Dict, Any
 from pydantic import BaseModel
 
 from src.llm_providers.base import LLMProvider
+from src.pdf_processing.document import as_document
 from src.pdf_processing.processor import PDFProcessor
+from src.pdf_processing.source import PDFInput
 from src.vector_store.qdrant_store import VectorStore
+from src.instrumentation import traced
 from .base import Agent
 
 class SummarizationAgent(Agent):
@@ -20,9 +23,9 @@ class DocumentSummaryAgent(SummarizationAgent):
     description: str = "Summarizes the entire PDF."
     pdf_processor: PDFProcessor
 
-    def run(self, pdf_path: str) -> str:
-        extracted_content = self.pdf_processor.extract_content(pdf_path)
-        full_text = "\n".join([page["text"] for page in extracted_content])
+    @traced("agent.run")
+    def run(self, pdf_path: PDFInput) -> str:
+        full_text = as_document(self.pdf_processor.extract_content(pdf_path)).text
         return self._summarize(full_text, summary_type="document")
 
 class SectionSummaryAgent(SummarizationAgent):
@@ -31,16 +34,10 @@ class SectionSummaryAgent(SummarizationAgent):
     description: str = "Accepts a section or heading and summarizes its content."
     pdf_processor: PDFProcessor
 
-    def run(self, pdf_path: str, section_heading: str) -> str:
-        extracted_content = self.pdf_processor.extract_content(pdf_path)
-        section_text = ""
-        for page_content in extracted_content:
-            for section in page_content["sections"]:
-                if section["heading"] == section_heading:
-                    section_text = section["heading"] + "\n" + "\n".join(section["paragraphs"])
-                    break
-            if section_text:
-                break
+    @traced("agent.run")
+    def run(self, pdf_path: PDFInput, section_heading: str) -> str:
+        document = as_document(self.pdf_processor.extract_content(pdf_path))
+        section_text = next((section.text for section in document.sections if section.heading == section_heading), "")
         if not section_text:
             return f"Section with heading \'{section_heading}\' not found."
         return self._summarize(section_text, summary_type="section")
@@ -51,12 +48,13 @@ class PageBasedSummaryAgent(SummarizationAgent):
     description: str = "Summarizes content based on a page number or range."
     pdf_processor: PDFProcessor
 
-    def run(self, pdf_path: str, page_numbers: List[int]) -> str:
-        extracted_content = self.pdf_processor.extract_content(pdf_path)
+    @traced("agent.run")
+    def run(self, pdf_path: PDFInput, page_numbers: List[int]) -> str:
+        document = as_document(self.pdf_processor.extract_content(pdf_path))
         pages_text = []
         for page_num in page_numbers:
-            if 0 < page_num <= len(extracted_content):
-                pages_text.append(extracted_content[page_num - 1]["text"])
+            if 0 < page_num <= len(document):
+                pages_text.append(document[page_num - 1].text)
         if not pages_text:
             return f"No content found for page numbers: {page_numbers}"
         full_pages_text = "\n".join(pages_text)
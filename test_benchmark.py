@@ -0,0 +1,36 @@
+import io
+import unittest
+from pypdf import PdfReader
+
+from benchmark import compare, latency_stats
+from fixtures import make_synthetic_pdf
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_make_synthetic_pdf(self):
+        reader = PdfReader(io.BytesIO(make_synthetic_pdf(3)))
+        self.assertEqual(len(reader.pages), 3)
+        text = reader.pages[1].extract_text()
+        self.assertIn("ACME Corporation", text)
+        self.assertIn("Page 2 of 3", text)
+
+    def test_latency_stats(self):
+        stats = latency_stats([0.001 * i for i in range(1, 101)])
+        self.assertAlmostEqual(stats["p50_ms"], 51.0)
+        self.assertAlmostEqual(stats["p99_ms"], 99.0)
+
+    def test_compare_reports_regressions(self):
+        baseline = {"results": [
+            {"benchmark": "extraction", "size": 10, "metric": "pages_per_sec", "value": 100.0, "higher_is_better": True},
+            {"benchmark": "retrieval", "size": 10, "metric": "p95_ms", "value": 2.0, "higher_is_better": False},
+        ]}
+        current = {"results": [
+            {"benchmark": "extraction", "size": 10, "metric": "pages_per_sec", "value": 95.0, "higher_is_better": True},
+            {"benchmark": "retrieval", "size": 10, "metric": "p95_ms", "value": 3.0, "higher_is_better": False},
+        ]}
+        regressions = compare(current, baseline, tolerance=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("retrieval", regressions[0])
+
+if __name__ == "__main__":
+    unittest.main()
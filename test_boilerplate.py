@@ -0,0 +1,51 @@
+import unittest
+
+from src.pdf_processing.boilerplate import BoilerplateFilter, line_key
+
+class TestBoilerplateFilter(unittest.TestCase):
+
+    def _page(self, number, body):
+        return f"ACME Corp Annual Report\n\n{body}\n\nThis report is confidential and intended for internal use only.\nPage {number} of 4"
+
+    def test_line_key(self):
+        self.assertEqual(line_key("Page 3 of 40"), line_key("  page 12 of 40 "))
+        self.assertEqual(line_key("- 3 -"), line_key("- 14 -"))
+        self.assertNotEqual(line_key("Total 10"), line_key("Total 12"))
+
+    def test_clean_strips_headers_footers_and_page_numbers(self):
+        pages = [self._page(i, f"Body text unique to page {i}.\nRevenue grew in region {i}.") for i in range(1, 5)]
+
+        cleaned, report = BoilerplateFilter().clean(pages)
+
+        for i, text in enumerate(cleaned, start=1):
+            self.assertNotIn("ACME Corp", text)
+            self.assertNotIn("confidential", text)
+            self.assertNotIn("Page", text)
+            self.assertIn(f"Body text unique to page {i}.", text)
+            self.assertIn(f"Revenue grew in region {i}.", text)
+        self.assertEqual(report["removed_lines"], 12)
+        self.assertGreater(report["tokens_saved"], 0)
+        self.assertIn("acme corp annual report", report["patterns"])
+
+    def test_clean_keeps_short_documents_and_unrepeated_lines(self):
+        pages = [self._page(1, "Only page.")]
+        cleaned, report = BoilerplateFilter().clean(pages)
+        self.assertEqual(cleaned, pages)
+        self.assertEqual(report["removed_lines"], 0)
+
+        # A line repeated on only a minority of pages is content, not boilerplate.
+        pages = ["Intro\nShared sentence that appears twice in the body.\nA"] * 2 + [f"Other {i}\nB" for i in range(4)]
+        cleaned, _ = BoilerplateFilter().clean(pages)
+        self.assertIn("Shared sentence", cleaned[0])
+
+    def test_clean_keeps_numeric_table_bodies(self):
+        pages = [f"Statement\nItem A {i}\nItem B {i + 4}\nTotal {2 * i + 4}" for i in range(8)]
+        pages += [f"Chapter {i}\nText of chapter {i}.\nFigure {i}" for i in range(1, 9)]
+
+        cleaned, _ = BoilerplateFilter().clean(pages)
+
+        self.assertEqual(cleaned[0], "Item A 0\nItem B 4\nTotal 4")
+        self.assertEqual(cleaned[8], "Chapter 1\nText of chapter 1.\nFigure 1")
+
+if __name__ == "__main__":
+    unittest.main()
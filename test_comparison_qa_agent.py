@@ -1,7 +1,11 @@
 import unittest
 from unittest.mock import MagicMock, patch
+from qdrant_client import QdrantClient
+
+from fixtures import make_synthetic_pdf
 from src.agents.comparison_qa_agent import ComparisonQAAgent
 from src.llm_providers.base import LLMProvider
+from src.llm_providers.fake import FakeLLMProvider
 from src.pdf_processing.processor import PDFProcessor
 from src.vector_store.qdrant_store import VectorStore
 
@@ -50,6 +54,37 @@ class TestComparisonQAAgent(unittest.TestCase):
             self.assertIn("Answer from LLM.", response["answer"])
             self.assertIn({"document": "doc1", "page_number": 1, "section": "Section A", "text_snippet": "Relevant text from doc1"}, response["references"])
 
+    def test_run_batch(self):
+        self.mock_llm_provider.generate_embeddings = MagicMock(return_value=[[0.1, 0.2], [0.3, 0.4]])
+        self.mock_vector_store.retrieve_similar_batch.return_value = [
+            [{"text": "Payment within 30 days", "score": 0.9, "metadata": {"doc_id": "doc1", "page_number": 2, "heading": "Payment"}}],
+            [{"text": "Either party may terminate", "score": 0.8, "metadata": {"doc_id": "doc2", "page_number": 5, "heading": "Termination"}}],
+        ]
+        self.mock_llm_provider.generate_text.side_effect = lambda prompt: "Answer: " + prompt.rsplit("Question: ", 1)[1]
+
+        with patch.object(self.agent, "_embed_and_store_pdf") as mock_embed:
+            responses = self.agent.run_batch("pdf1.pdf", "pdf2.pdf", ["Payment terms?", "Termination?"])
+
+            self.assertEqual(mock_embed.call_count, 2)
+            self.mock_llm_provider.generate_embeddings.assert_called_once_with(["Payment terms?", "Termination?"])
+            self.mock_llm_provider.generate_embedding.assert_not_called()
+            self.mock_vector_store.retrieve_similar_batch.assert_called_once_with([[0.1, 0.2], [0.3, 0.4]], top_k=10, doc_ids=["doc1", "doc2"])
+            self.assertEqual(self.mock_llm_provider.generate_text.call_count, 2)
+            self.assertEqual([r["question"] for r in responses], ["Payment terms?", "Termination?"])
+            self.assertIn("Payment terms?", responses[0]["answer"])
+            self.assertEqual(responses[0]["references"][0]["section"], "Payment")
+            self.assertEqual(responses[1]["references"][0]["document"], "doc2")
+
+    def test_both_documents_are_referenced(self):
+        vector_store = VectorStore(client=QdrantClient(":memory:"), collection_name="qa", vector_size=64)
+        agent = ComparisonQAAgent(llm_provider=FakeLLMProvider(dimension=64), pdf_processor=PDFProcessor(), vector_store=vector_store)
+
+        # Same chunk count for both, so positional ids would let doc2 replace doc1 entirely
+        responses = agent.run_batch(make_synthetic_pdf(3), make_synthetic_pdf(3, seed=1), ["Payment terms?"])
+
+        self.assertEqual(vector_store.client.count("qa").count, 6)
+        self.assertEqual({reference["document"] for reference in responses[0]["references"]}, {"doc1", "doc2"})
+
 if __name__ == "__main__":
     unittest.main()
 
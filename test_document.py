@@ -0,0 +1,56 @@
+import unittest
+
+from fixtures import legacy_pages, retained_bytes
+from src.pdf_processing.document import Document, as_document
+from src.pdf_processing.processor import PDFProcessor
+
+PAGE_TEXTS = [
+    "Intro heading\n\n  First paragraph.  \n\nSecond paragraph.",
+    "",
+    "Only paragraph\nwith two lines.\n\n\n\n",
+]
+
+class TestDocument(unittest.TestCase):
+
+    def test_matches_legacy_dicts(self):
+        document = Document.from_page_texts(PAGE_TEXTS)
+        self.assertEqual(len(document), 3)
+        self.assertEqual(document.to_dicts(), legacy_pages(PAGE_TEXTS))
+        self.assertEqual(document.text, "\n".join(PAGE_TEXTS))
+
+    def test_dict_style_access(self):
+        page = Document.from_page_texts(PAGE_TEXTS)[-1]
+        self.assertEqual(page["page_number"], 3)
+        self.assertEqual(page["text"], PAGE_TEXTS[2])
+        section = page["sections"][0]
+        self.assertEqual(section["heading"], "Page 3")
+        self.assertEqual(section["paragraphs"], ["Only paragraph\nwith two lines."])
+        self.assertEqual(section.get("tables"), [])
+        with self.assertRaises(KeyError):
+            page["missing"]
+        with self.assertRaises(IndexError):
+            Document.from_page_texts(PAGE_TEXTS)[3]
+
+    def test_from_legacy_pages(self):
+        pages = [
+            {"page_number": 1, "text": "Page text.", "sections": [{"heading": "Intro", "paragraphs": ["Page text.", "Not in text."]}]},
+            {"page_number": 2, "text": "More.", "sections": [{"heading": "Page 2", "paragraphs": ["More."], "tables": []}]},
+        ]
+        document = as_document(pages)
+        self.assertEqual(document.text, "Page text.\nMore.")
+        self.assertEqual([section.heading for section in document.sections], ["Intro", "Page 2"])
+        self.assertEqual(document[0].sections[0].paragraphs, ["Page text.", "Not in text."])
+        self.assertEqual(document[1].sections[0].page_number, 2)
+        self.assertIs(as_document(document), document)
+
+    def test_chunking_accepts_both_forms(self):
+        processor = PDFProcessor()
+        document = Document.from_page_texts(PAGE_TEXTS)
+        self.assertEqual(processor.semantic_chunking(document), processor.semantic_chunking(legacy_pages(PAGE_TEXTS)))
+
+    def test_smaller_than_legacy_dicts(self):
+        page_texts = ["\n\n".join(f"Paragraph {i} of page {n}. " * 10 for i in range(5)) for n in range(50)]
+        self.assertLess(retained_bytes(Document.from_page_texts, page_texts), retained_bytes(legacy_pages, page_texts))
+
+if __name__ == "__main__":
+    unittest.main()
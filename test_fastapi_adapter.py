@@ -0,0 +1,120 @@
+import json
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient
+
+from fixtures import make_synthetic_pdf
+from src.agents.comparison_qa_agent import ComparisonQAAgent
+from src.agents.summarization_agents import DocumentSummaryAgent
+from src.fastapi_adapter import JobRegistry, create_router
+from src.llm_providers.fake import FakeLLMProvider
+from src.pdf_processing.processor import PDFProcessor
+from src.vector_store.qdrant_store import VectorStore
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n") if not line.startswith(":"))
+        if lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+class TestFastAPIAdapter(unittest.TestCase):
+
+    def setUp(self):
+        provider = FakeLLMProvider(dimension=64)
+        processor = PDFProcessor()
+        self.vector_store = VectorStore(client=QdrantClient(":memory:"), collection_name="api", vector_size=64)
+        agents = {
+            "document_summary": DocumentSummaryAgent(llm_provider=provider, pdf_processor=processor),
+            "comparison_qa": ComparisonQAAgent(llm_provider=provider, pdf_processor=processor, vector_store=self.vector_store),
+        }
+        app = FastAPI()
+        app.include_router(create_router(agents, max_upload_bytes=1 << 20), prefix="/pdf")
+        self.client = TestClient(app)
+        self.pdf = make_synthetic_pdf(3)
+
+    def test_ingestion_job(self):
+        response = self.client.post("/pdf/documents", files={"file": ("report.pdf", self.pdf, "application/pdf")})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["job_id"]
+
+        # TestClient runs background tasks before returning the response
+        job = self.client.get(f"/pdf/jobs/{job_id}").json()
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(job["result"], {"doc_id": "report.pdf", "chunks": 3, "skipped": False})
+        self.assertEqual(self.vector_store.client.count("api").count, 3)
+
+        # The same content is recognised by its hash and not ingested again
+        again = self.client.post("/pdf/documents", files={"file": ("report.pdf", self.pdf, "application/pdf")}).json()
+        self.assertTrue(self.client.get(f"/pdf/jobs/{again['job_id']}").json()["result"]["skipped"])
+        self.assertEqual(self.client.get("/pdf/jobs/unknown").status_code, 404)
+
+    def test_failed_job(self):
+        response = self.client.post("/pdf/documents", files={"file": ("broken.pdf", b"not a pdf", "application/pdf")})
+        job = self.client.get(f"/pdf/jobs/{response.json()['job_id']}").json()
+        self.assertEqual(job["status"], "failed")
+        self.assertTrue(job["error"])
+
+    def test_upload_too_large(self):
+        response = self.client.post("/pdf/summaries", files={"file": ("big.pdf", b"0" * ((1 << 20) + 1), "application/pdf")})
+        self.assertEqual(response.status_code, 413)
+
+    def test_streamed_summary(self):
+        response = self.client.post("/pdf/summaries", files={"file": ("report.pdf", self.pdf, "application/pdf")})
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = parse_events(response.text)
+        self.assertEqual([event for event, _ in events], ["started", "summary", "done"])
+        self.assertTrue(events[1][1]["summary"].startswith("Fake response"))
+
+    def test_streamed_answers(self):
+        response = self.client.post(
+            "/pdf/qa",
+            files={"pdf1": ("a.pdf", self.pdf, "application/pdf"), "pdf2": ("b.pdf", make_synthetic_pdf(2, seed=1), "application/pdf")},
+            data={"questions": ["Payment terms?", "Termination notice?"]},
+        )
+        events = parse_events(response.text)
+        answers = [data for event, data in events if event == "answer"]
+        self.assertEqual(events[-1][0], "done")
+        self.assertEqual(sorted(answer["index"] for answer in answers), [0, 1])
+        self.assertEqual({answer["question"] for answer in answers}, {"Payment terms?", "Termination notice?"})
+        self.assertTrue(all(answer["references"] for answer in answers))
+
+    def test_answers_only_cite_the_uploaded_documents(self):
+        self.client.post("/pdf/documents", files={"file": ("unrelated.pdf", make_synthetic_pdf(3, seed=2), "application/pdf")})
+
+        def ask(seed: int):
+            response = self.client.post(
+                "/pdf/qa",
+                files={"pdf1": ("a.pdf", make_synthetic_pdf(3, seed=seed), "application/pdf"),
+                       "pdf2": ("b.pdf", make_synthetic_pdf(3, seed=seed + 1), "application/pdf")},
+                data={"questions": ["Payment terms?"]},
+            )
+            return [data for event, data in parse_events(response.text) if event == "answer"]
+
+        # Each request stores its uploads under its own ids and only cites those
+        answers = [ask(10), ask(20)]
+        for (answer,) in answers:
+            self.assertEqual({reference["document"] for reference in answer["references"]}, {"doc1", "doc2"})
+        first, second = ({reference["text_snippet"] for reference in answer["references"]} for (answer,) in answers)
+        self.assertFalse(first & second)
+        # Only the ingested document is left in the collection
+        self.assertEqual(self.vector_store.client.count("api").count, 3)
+
+    def test_error_event(self):
+        response = self.client.post("/pdf/summaries", files={"file": ("broken.pdf", b"not a pdf", "application/pdf")})
+        events = parse_events(response.text)
+        self.assertEqual(events[-1][0], "error")
+
+    def test_job_registry_prunes_finished_jobs(self):
+        jobs = JobRegistry(max_finished=1)
+        first = jobs.create()
+        jobs.run(first["job_id"], lambda: 1)
+        second = jobs.create()
+        jobs.run(second["job_id"], lambda: 2)
+        self.assertIsNone(jobs.get(first["job_id"]))
+        self.assertEqual(jobs.get(second["job_id"])["result"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from pypdf import PdfWriter
+
+from src.ingestion import BulkIngestor, discover_documents
+from src.instrumentation import InMemorySink, configure
+from src.llm_providers.embeddings import chunk_ids
+from src.llm_providers.fake import FakeLLMProvider
+from src.pdf_processing.processor import PDFProcessor
+from src.vector_store.qdrant_store import VectorStore
+
+class TestBulkIngestor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmpdir.name, "pdfs")
+        os.makedirs(os.path.join(self.source, "nested"))
+        for name in ("a.pdf", "b.pdf", os.path.join("nested", "c.pdf"), "notes.txt"):
+            with open(os.path.join(self.source, name), "wb") as f:
+                f.write(b"%PDF-1.4")
+        self.checkpoint_path = os.path.join(self.tmpdir.name, "ingest.ckpt")
+
+        self.mock_pdf_processor = MagicMock(spec=PDFProcessor)
+        self.mock_pdf_processor.extract_content.return_value = [
+            {"page_number": 1, "text": "p1", "sections": [{"heading": "Page 1", "paragraphs": ["p1"]}]},
+            {"page_number": 2, "text": "p2", "sections": [{"heading": "Page 2", "paragraphs": ["p2"]}]},
+        ]
+        self.mock_pdf_processor.semantic_chunking.return_value = ["Page 1\np1", "Page 2\np2"]
+        self.mock_vector_store = MagicMock(spec=VectorStore)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _ingestor(self, **kwargs):
+        return BulkIngestor(
+            FakeLLMProvider(dimension=8),
+            self.mock_vector_store,
+            pdf_processor=self.mock_pdf_processor,
+            checkpoint_path=self.checkpoint_path,
+            extract_workers=0,
+            **kwargs
+        )
+
+    def test_discover_documents_from_directory_and_manifest(self):
+        documents = discover_documents(self.source)
+        self.assertEqual([doc_id for doc_id, _ in documents], ["a.pdf", "b.pdf", os.path.join("nested", "c.pdf")])
+
+        manifest = os.path.join(self.source, "manifest.jsonl")
+        with open(manifest, "w") as f:
+            f.write(json.dumps({"path": "a.pdf", "doc_id": "contract-a"}) + "\n")
+            f.write("b.pdf\n")
+        documents = discover_documents(manifest)
+        self.assertEqual(documents, [("contract-a", os.path.join(self.source, "a.pdf")), ("b.pdf", os.path.join(self.source, "b.pdf"))])
+
+    def test_run_stores_in_bulk_with_stable_ids(self):
+        stats = self._ingestor(upsert_batch_size=100).run(self.source)
+
+        self.assertEqual(stats["ingested"], 3)
+        self.assertEqual(stats["chunks"], 6)
+        self.assertEqual(stats["failed"], [])
+        self.assertGreater(stats["chunks_per_sec"], 0)
+        # All three small documents fit into a single bulk write
+        self.mock_vector_store.store_embeddings.assert_called_once()
+        args, kwargs = self.mock_vector_store.store_embeddings.call_args
+        chunks, embeddings, metadata = args
+        self.assertEqual(len(chunks), 6)
+        self.assertEqual(len(embeddings), 6)
+        self.assertEqual(len(set(kwargs["ids"])), 6)
+        self.assertIn(chunk_ids("a.pdf", 2)[0], kwargs["ids"])
+        self.assertEqual({m["doc_id"] for m in metadata}, {"a.pdf", "b.pdf", os.path.join("nested", "c.pdf")})
+
+    def test_embedding_spans_roll_up_to_the_run(self):
+        sink = InMemorySink()
+        configure(sink)
+        self.addCleanup(configure)
+        self._ingestor(embed_workers=2).run(self.source)
+
+        (run_span,) = sink.find("ingestion.run")
+        embedding_spans = sink.find("llm.generate_embeddings")
+        self.assertEqual(len(embedding_spans), 3)
+        self.assertTrue(all(span.parent is run_span for span in embedding_spans))
+        self.assertEqual(run_span.counters["prompt_tokens"], sum(span.counters["prompt_tokens"] for span in embedding_spans))
+
+    def test_run_resumes_from_checkpoint(self):
+        self.mock_pdf_processor.extract_content.side_effect = [
+            self.mock_pdf_processor.extract_content.return_value,
+            ValueError("corrupt PDF"),
+            self.mock_pdf_processor.extract_content.return_value,
+        ]
+        stats = self._ingestor(upsert_batch_size=1).run(self.source)
+        self.assertEqual(stats["ingested"], 2)
+        self.assertEqual(stats["failed"][0]["stage"], "extract")
+
+        self.mock_pdf_processor.extract_content.side_effect = None
+        self.mock_vector_store.store_embeddings.reset_mock()
+        stats = self._ingestor().run(self.source)
+
+        self.assertEqual(stats["skipped"], 2)
+        self.assertEqual(stats["ingested"], 1)
+        self.assertEqual(self.mock_vector_store.store_embeddings.call_count, 1)
+
+    def test_changed_document_drops_stale_chunks(self):
+        self._ingestor().run(self.source)
+        self.mock_vector_store.delete_points.assert_not_called()
+
+        # a.pdf changes and now yields a single chunk
+        with open(os.path.join(self.source, "a.pdf"), "wb") as f:
+            f.write(b"%PDF-1.4 shorter revision")
+        self.mock_pdf_processor.extract_content.return_value = self.mock_pdf_processor.extract_content.return_value[:1]
+        self.mock_pdf_processor.semantic_chunking.return_value = ["Page 1\np1"]
+        stats = self._ingestor().run(self.source)
+
+        self.assertEqual(stats["ingested"], 1)
+        self.mock_vector_store.delete_points.assert_called_once_with(chunk_ids("a.pdf", 2)[1:])
+
+    def test_extraction_worker_processes(self):
+        # Extraction in spawned worker processes, with a real PDF processor
+        writer = PdfWriter()
+        writer.add_blank_page(width=72, height=72)
+        with open(os.path.join(self.source, "a.pdf"), "wb") as f:
+            writer.write(f)
+        ingestor = BulkIngestor(FakeLLMProvider(dimension=8), self.mock_vector_store, checkpoint_path=self.checkpoint_path, extract_workers=2)
+        stats = ingestor.run(self.source)
+        self.assertEqual(stats["ingested"], 1)
+        self.assertEqual(sorted(failure["doc_id"] for failure in stats["failed"]), ["b.pdf", os.path.join("nested", "c.pdf")])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import logging
+import unittest
+from unittest.mock import MagicMock
+
+from src.instrumentation import InMemorySink, LoggingSink, Tracer, configure, get_tracer, record, traced
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.sink = InMemorySink()
+        configure(self.sink)
+
+    def tearDown(self):
+        configure()
+
+    def test_counters_roll_up_to_parent_span(self):
+        tracer = get_tracer()
+        with tracer.span("agent.run", component="TestAgent") as outer:
+            with tracer.span("llm.generate_text"):
+                record(prompt_tokens=10, completion_tokens=5)
+            with tracer.span("llm.generate_text"):
+                record(prompt_tokens=3)
+
+        self.assertEqual(outer.counters, {"prompt_tokens": 13, "completion_tokens": 5})
+        self.assertEqual(len(self.sink.find("llm.generate_text")), 2)
+        self.assertEqual(self.sink.find("llm.generate_text")[0].parent, outer)
+        self.assertEqual(self.sink.totals("agent.run")["TestAgent"]["prompt_tokens"], 13)
+
+    def test_traced_records_component_and_errors(self):
+        class Worker:
+            @traced("worker.call")
+            def call(self, fail=False):
+                record(bytes_out=4)
+                if fail:
+                    raise RuntimeError("boom")
+                return "ok"
+
+        self.assertEqual(Worker().call(), "ok")
+        with self.assertRaises(RuntimeError):
+            Worker().call(fail=True)
+
+        spans = self.sink.find("worker.call")
+        self.assertEqual(spans[0].attributes["component"], "Worker")
+        self.assertIsNone(spans[0].error)
+        self.assertIn("boom", spans[1].error)
+        self.assertGreaterEqual(spans[0].duration, 0)
+
+    def test_record_outside_span_is_noop(self):
+        record(prompt_tokens=1)
+        self.assertEqual(self.sink.spans, [])
+
+    def test_logging_sink_and_metrics(self):
+        log = MagicMock(spec=logging.Logger)
+        tracer = Tracer([LoggingSink(log), self.sink])
+        with tracer.span("vector_store.search", top_k=5):
+            pass
+        tracer.metric("cache.hits", 2, cache="translation")
+
+        self.assertEqual(log.log.call_count, 2)
+        self.assertEqual(self.sink.metrics, [{"name": "cache.hits", "value": 2, "attributes": {"cache": "translation"}}])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,20 @@
 import unittest
+import json
 import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 from src.llm_providers.base import LLMProvider
 from src.llm_providers.azure_openai import AzureOpenAIProvider
 from src.llm_providers.ollama import OllamaProvider
 from src.llm_providers.gemini import GeminiProvider
-from src.llm_providers.provider_factory import get_llm_provider
+from src.llm_providers.fake import FakeLLMProvider
+from src.llm_providers import provider_factory
+from src.llm_providers.provider_factory import get_llm_provider, register_provider, available_providers
 
 class TestLLMProviders(unittest.TestCase):
 
@@ -28,8 +36,11 @@ class TestLLMProviders(unittest.TestCase):
             provider = OllamaProvider("http://localhost:11434", "llama2")
             self.assertEqual(provider.generate_text("test"), "Ollama response")
             
-            mock_post.return_value.json.return_value = {"embedding": [0.4, 0.5, 0.6]}
+            self.assertEqual(mock_post.call_args.kwargs["json"]["stream"], False)
+
+            mock_post.return_value.json.return_value = {"embeddings": [[0.4, 0.5, 0.6]]}
             self.assertEqual(provider.generate_embedding("test"), [0.4, 0.5, 0.6])
+            self.assertTrue(mock_post.call_args.args[0].endswith("/api/embed"))
             self.assertEqual(provider.get_model_name(), "llama2")
 
     def test_gemini_provider(self):
@@ -44,6 +55,14 @@ class TestLLMProviders(unittest.TestCase):
             self.assertEqual(provider.generate_embedding("test"), [0.7, 0.8, 0.9])
             self.assertEqual(provider.get_model_name(), "gemini-pro")
 
+    def test_fake_provider(self):
+        provider = FakeLLMProvider(dimension=64)
+        self.assertEqual(provider.generate_text("test"), provider.generate_text("test"))
+        embedding = provider.generate_embedding("payment terms")
+        self.assertEqual(len(embedding), 64)
+        self.assertEqual(embedding, provider.generate_embedding("Payment  terms"))
+        self.assertEqual(provider.get_model_name(), "fake")
+
     @patch("src.llm_providers.azure_openai.AzureOpenAIProvider")
     @patch("src.llm_providers.ollama.OllamaProvider")
     @patch("src.llm_providers.gemini.GeminiProvider")
@@ -65,7 +84,116 @@ class TestLLMProviders(unittest.TestCase):
             with self.assertRaises(ValueError):
                 get_llm_provider("unknown_provider")
 
+    def test_provider_factory_registry(self):
+        with patch.dict(provider_factory._PROVIDERS):
+            register_provider("custom", FakeLLMProvider)
+            self.assertIn("custom", available_providers())
+            self.assertIsInstance(get_llm_provider("custom", dimension=8), FakeLLMProvider)
+        self.assertNotIn("custom", available_providers())
+
+    def _modules_loaded_by(self, module: str, heavy_modules) -> str:
+        code = f"import sys, {module}; print(','.join(m for m in {tuple(heavy_modules)!r} if m in sys.modules))"
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+        return result.stdout.strip()
+
+    def test_provider_factory_import_is_lazy(self):
+        # Guards cold start: importing the factory must not import any backend SDK.
+        self.assertEqual(self._modules_loaded_by("src.llm_providers.provider_factory", ("openai", "google.generativeai", "requests")), "")
+
+    def test_main_import_is_lazy(self):
+        # Agents, PDF parsing and Qdrant are only imported when get_agents() first runs.
+        heavy_modules = ("openai", "google.generativeai", "requests", "qdrant_client", "numpy", "pypdf", "src.agents.comparison_qa_agent")
+        self.assertEqual(self._modules_loaded_by("main", heavy_modules), "")
+
+    def _get_agents(self, provider):
+        import main
+        main.get_agents.cache_clear()
+        self.addCleanup(main.get_agents.cache_clear)
+        with patch.object(main, "LLM_PROVIDER", "ollama"), patch.object(main, "OLLAMA_EMBEDDING_MODEL", "nomic-embed-text"), \
+                patch.object(main, "OLLAMA_KEEP_ALIVE", "-1"), patch.object(main, "get_llm_provider", return_value=provider) as mock_factory:
+            agents = main.get_agents()
+        mock_factory.assert_called_once_with(
+            "ollama", base_url=main.OLLAMA_BASE_URL, model_name=main.OLLAMA_MODEL, chat_model=None,
+            embedding_model="nomic-embed-text", keep_alive=-1,
+        )
+        return agents
+
+    def test_get_agents_warms_up_provider(self):
+        provider = MagicMock(spec=OllamaProvider)
+        agents = self._get_agents(provider)
+        provider.warm_up.assert_called_once_with()
+        self.assertIs(agents["comparison_qa"].llm_provider, provider)
+
+    def test_get_agents_survives_failed_warm_up(self):
+        provider = MagicMock(spec=OllamaProvider)
+        provider.warm_up.side_effect = ConnectionError("connection refused")
+        with self.assertLogs("main", "WARNING"):
+            self._get_agents(provider)
+
+class _StubOllama(BaseHTTPRequestHandler):
+    """Minimal Ollama API that takes `load_delay` seconds to load a model it hasn't served yet."""
+    load_delay = 0.3
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        server.requests.append((self.path, payload))
+        load_duration = 0
+        with server.lock:
+            if payload["model"] not in server.loaded:
+                time.sleep(self.load_delay)
+                server.loaded.add(payload["model"])
+                load_duration = int(self.load_delay * 1e9)
+        if self.path == "/api/generate":
+            body = {"response": "Stub response" if payload.get("prompt") else "", "load_duration": load_duration}
+        else:
+            texts = payload["input"] if isinstance(payload["input"], list) else [payload["input"]]
+            body = {"embeddings": [[float(len(text)), 1.0] for text in texts], "load_duration": load_duration}
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+class TestOllamaWarmUp(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+        self.server.requests, self.server.loaded, self.server.lock = [], set(), threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.provider = OllamaProvider(f"127.0.0.1:{self.server.server_port}", "llama3", embedding_model="nomic-embed-text", keep_alive="30m")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _first_calls(self) -> float:
+        start = time.perf_counter()
+        self.assertEqual(self.provider.generate_text("Hello"), "Stub response")
+        self.assertEqual(self.provider.generate_embedding("Hello"), [5.0, 1.0])
+        return time.perf_counter() - start
+
+    def test_cold_start(self):
+        # Without warm-up the first requests pay for loading both models
+        self.assertGreaterEqual(self._first_calls(), 2 * _StubOllama.load_delay)
+
+    def test_warm_up_removes_cold_start(self):
+        loads = self.provider.warm_up()
+        self.assertEqual(loads, {"llama3": _StubOllama.load_delay, "nomic-embed-text": _StubOllama.load_delay})
+        self.assertLess(self._first_calls(), _StubOllama.load_delay)
+        # Chat and embedding requests go to their own models and keep them loaded
+        self.assertEqual([(path, payload["model"]) for path, payload in self.server.requests[2:]],
+                         [("/api/generate", "llama3"), ("/api/embed", "nomic-embed-text")])
+        self.assertTrue(all(payload["keep_alive"] == "30m" for _, payload in self.server.requests))
+
+    def test_batched_embeddings(self):
+        self.assertEqual(self.provider.generate_embeddings(["a", "bb", "ccc"]), [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]])
+        self.assertEqual(len(self.server.requests), 1)
+
 if __name__ == "__main__":
     unittest.main()
-
-
@@ -40,6 +40,28 @@ class TestPDFProcessor(unittest.TestCase):
         self.assertIn("Page 1 content", extracted_data[0]["text"])
         self.assertIn("Section 1 heading", extracted_data[0]["sections"][0]["heading"])
 
+    @patch("src.pdf_processing.processor.PdfReader")
+    def test_extract_content_removes_boilerplate(self, MockPdfReader):
+        pages = []
+        for i in range(1, 5):
+            page = MagicMock()
+            page.extract_text.return_value = f"Confidential Draft\n\nFindings for page {i}.\n\nPage {i}"
+            pages.append(page)
+        MockPdfReader.return_value.pages = pages
+
+        processor = PDFProcessor(remove_boilerplate=True)
+        extracted_data = processor.extract_content(self.mock_pdf_path)
+
+        self.assertEqual(extracted_data[1]["text"], "Findings for page 2.")
+        self.assertEqual(extracted_data[1]["sections"][0]["paragraphs"], ["Findings for page 2."])
+        self.assertEqual(extracted_data.boilerplate_report["removed_lines"], 8)
+        self.assertGreater(extracted_data.boilerplate_report["tokens_saved"], 0)
+
+        # Disabled by default
+        unstripped = self.processor.extract_content(self.mock_pdf_path)
+        self.assertIn("Confidential Draft", unstripped[0]["text"])
+        self.assertIsNone(unstripped.boilerplate_report)
+
     def test_semantic_chunking(self):
         mock_extracted_content = [
             {"page_number": 1, "text": "This is a sentence. This is another sentence.", 
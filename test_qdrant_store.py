@@ -1,7 +1,10 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 from qdrant_client import QdrantClient, models
 from src.vector_store.qdrant_store import VectorStore
+from src.vector_store.reduction import PCAReducer, RandomProjectionReducer
 
 class TestVectorStore(unittest.TestCase):
 
@@ -20,7 +23,11 @@ class TestVectorStore(unittest.TestCase):
         self.vector_store = VectorStore(client=self.mock_client_instance, collection_name="test_collection")
 
     def test_create_collection_if_not_exists(self):
-        # The collection is created in setUp, so we just need to assert it was called
+        # Construction does not touch Qdrant; the collection is created on first use
+        self.mock_client_instance.get_collections.assert_not_called()
+        self.vector_store.store_embeddings(["chunk"], [[0.1, 0.2]])
+        self.vector_store.retrieve_similar([0.1, 0.2])
+        self.mock_client_instance.get_collections.assert_called_once()
         self.mock_client_instance.recreate_collection.assert_called_once_with(
             collection_name="test_collection",
             vectors_config=models.VectorParams(size=1536, distance=models.Distance.COSINE),
@@ -59,6 +66,115 @@ class TestVectorStore(unittest.TestCase):
         self.assertEqual(results[0]["text"], "result1")
         self.assertEqual(results[1]["score"], 0.8)
 
+    def test_retrieve_similar_batch(self):
+        self.mock_client_instance.search_batch.return_value = [
+            [MagicMock(payload={"text": "result1", "doc_id": "docA"}, score=0.9)],
+            [MagicMock(payload={"text": "result2", "doc_id": "docB"}, score=0.8)],
+        ]
+
+        results = self.vector_store.retrieve_similar_batch([[0.1, 0.2], [0.3, 0.4]], top_k=3)
+
+        self.mock_client_instance.search_batch.assert_called_once()
+        requests = self.mock_client_instance.search_batch.call_args.kwargs["requests"]
+        self.assertEqual([r.limit for r in requests], [3, 3])
+        self.assertEqual(requests[1].vector, [0.3, 0.4])
+        self.assertEqual(results[0][0]["text"], "result1")
+        self.assertEqual(results[1][0]["metadata"]["doc_id"], "docB")
+
+    def test_delete_points(self):
+        self.vector_store.delete_points(["a", "b"])
+        self.mock_client_instance.delete.assert_called_once_with(
+            collection_name="test_collection", points_selector=models.PointIdsList(points=["a", "b"])
+        )
+
+    def test_filter_and_delete_by_document(self):
+        vector_store = VectorStore(client=QdrantClient(":memory:"), collection_name="docs", vector_size=2)
+        metadata = [{"doc_id": "x"}, {"doc_id": "y"}, {"doc_id": "z"}]
+        vector_store.store_embeddings(["a", "b", "c"], [[1.0, 0.0], [1.0, 0.1], [1.0, 0.2]], metadata, ids=[1, 2, 3])
+
+        hits = vector_store.retrieve_similar([1.0, 0.0], top_k=3, doc_ids=["y", "z"])
+        self.assertEqual({hit["metadata"]["doc_id"] for hit in hits}, {"y", "z"})
+        batch = vector_store.retrieve_similar_batch([[1.0, 0.0], [0.0, 1.0]], top_k=3, doc_ids=["x"])
+        self.assertEqual([[hit["text"] for hit in hits] for hits in batch], [["a"], ["a"]])
+
+        vector_store.delete_documents(["x", "y"])
+        self.assertEqual(vector_store.client.count("docs").count, 1)
+
+    def test_reducer_sets_collection_size_and_reduces_vectors(self):
+        embeddings = [[float(i), float(i % 3), 1.0, 0.0] for i in range(6)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            reducer_path = os.path.join(tmpdir, "reducer.npz")
+            vector_store = VectorStore(client=self.mock_client_instance, collection_name="reduced", reducer=PCAReducer(2), reducer_path=reducer_path)
+            vector_store.fit_reducer(embeddings)
+            vector_store.store_embeddings([f"chunk{i}" for i in range(6)], embeddings)
+
+            self.mock_client_instance.recreate_collection.assert_called_once_with(
+                collection_name="reduced",
+                vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE),
+            )
+            points = self.mock_client_instance.upsert.call_args.kwargs["points"]
+            self.assertEqual(len(points[0].vector), 2)
+            self.mock_client_instance.search.return_value = []
+            vector_store.retrieve_similar(embeddings[0])
+            self.assertEqual(self.mock_client_instance.search.call_args.kwargs["query_vector"], points[0].vector)
+
+            # The fitted reducer is saved with the collection and picked up by later stores
+            reopened = VectorStore(client=self.mock_client_instance, collection_name="reduced", reducer=PCAReducer(2), reducer_path=reducer_path)
+            self.assertTrue(reopened.reducer.is_fitted)
+            self.assertEqual(reopened._reduce([embeddings[0]])[0], points[0].vector)
+            with self.assertRaises(RuntimeError):
+                reopened.fit_reducer(embeddings)
+
+    def test_existing_collection_size_must_match(self):
+        client = QdrantClient(":memory:")
+        VectorStore(client=client, collection_name="sized", vector_size=4).retrieve_similar([0.0] * 4)
+
+        VectorStore(client=client, collection_name="sized", vector_size=4).retrieve_similar([0.0] * 4)
+        with self.assertRaisesRegex(ValueError, "4-dimensional"):
+            VectorStore(client=client, collection_name="sized", reducer=RandomProjectionReducer(2)).retrieve_similar([0.0] * 4)
+
+    def test_saved_reducer_must_match_requested_one(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            reducer_path = os.path.join(tmpdir, "reducer.npz")
+            RandomProjectionReducer(2).fit([[0.0] * 4]).save(reducer_path)
+            with self.assertRaisesRegex(ValueError, "2 dimensions"):
+                VectorStore(client=self.mock_client_instance, reducer=RandomProjectionReducer(3), reducer_path=reducer_path)
+
+    def test_fit_reducer_without_reducer(self):
+        with self.assertRaisesRegex(RuntimeError, "no reducer"):
+            self.vector_store.fit_reducer([[0.1, 0.2]])
+
+    def test_unfitted_pca_reducer_is_rejected(self):
+        vector_store = VectorStore(client=self.mock_client_instance, collection_name="reduced", reducer=PCAReducer(4))
+        # PCA is not fitted implicitly on whatever batch comes first
+        with self.assertRaisesRegex(RuntimeError, "fit_reducer"):
+            vector_store.store_embeddings(["chunk"], [[0.1, 0.2, 0.3, 0.4, 0.5]])
+        with self.assertRaisesRegex(RuntimeError, "fit_reducer"):
+            vector_store.retrieve_similar([0.1, 0.2, 0.3, 0.4, 0.5])
+        self.mock_client_instance.upsert.assert_not_called()
+        self.mock_client_instance.search.assert_not_called()
+
+    def test_random_projection_is_fitted_on_first_use(self):
+        vector_store = VectorStore(client=self.mock_client_instance, collection_name="projected", reducer=RandomProjectionReducer(2))
+        vector_store.store_embeddings(["chunk"], [[0.1, 0.2, 0.3, 0.4]])
+        self.assertTrue(vector_store.reducer.is_fitted)
+        self.assertEqual(len(self.mock_client_instance.upsert.call_args.kwargs["points"][0].vector), 2)
+
+    def test_vector_size(self):
+        vector_store = VectorStore(client=self.mock_client_instance, collection_name="small", vector_size=256)
+        vector_store.retrieve_similar([0.0] * 256)
+        self.mock_client_instance.recreate_collection.assert_called_once_with(
+            collection_name="small",
+            vectors_config=models.VectorParams(size=256, distance=models.Distance.COSINE),
+        )
+
+    @patch("src.vector_store.qdrant_store.QdrantClient")
+    def test_client_created_lazily(self, MockQdrantClient):
+        vector_store = VectorStore(host="qdrant", port=6334)
+        MockQdrantClient.assert_not_called()
+        self.assertIs(vector_store.client, MockQdrantClient.return_value)
+        MockQdrantClient.assert_called_once_with(host="qdrant", port=6334)
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from src.vector_store.reduction import EmbeddingReducer, PCAReducer, RandomProjectionReducer
+
+class TestReduction(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # 200 vectors in 32 dimensions that mostly vary along 4 directions
+        self.embeddings = rng.standard_normal((200, 4)) @ rng.standard_normal((4, 32)) + 0.01 * rng.standard_normal((200, 32))
+
+    def test_pca_keeps_neighbours(self):
+        reducer = PCAReducer(4).fit(self.embeddings)
+        reduced = reducer.transform(self.embeddings)
+        self.assertEqual(reduced.shape, (200, 4))
+        self.assertEqual(reduced.dtype, np.float32)
+
+        def nearest(vectors):
+            normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+            similarities = normalized @ normalized.T
+            np.fill_diagonal(similarities, -np.inf)
+            return similarities.argmax(axis=1)
+
+        centered = self.embeddings - self.embeddings.mean(axis=0)
+        self.assertGreater((nearest(centered) == nearest(reduced)).mean(), 0.9)
+
+    def test_pca_needs_enough_samples(self):
+        with self.assertRaises(ValueError):
+            PCAReducer(64).fit(self.embeddings[:10])
+
+    def test_unfitted_and_mismatched_input(self):
+        reducer = RandomProjectionReducer(8)
+        with self.assertRaises(RuntimeError):
+            reducer.transform(self.embeddings)
+        reducer.fit(self.embeddings)
+        self.assertEqual(reducer.transform(self.embeddings[:3]).shape, (3, 8))
+        with self.assertRaises(ValueError):
+            reducer.transform([[1.0, 2.0]])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for reducer in (PCAReducer(4), RandomProjectionReducer(8, seed=3)):
+                path = os.path.join(tmpdir, f"{reducer.kind}.npz")
+                reducer.fit(self.embeddings).save(path)
+                loaded = EmbeddingReducer.load(path)
+                self.assertIsInstance(loaded, type(reducer))
+                self.assertEqual(loaded.output_dimension, reducer.output_dimension)
+                np.testing.assert_allclose(loaded.transform(self.embeddings[:5]), reducer.transform(self.embeddings[:5]), rtol=1e-5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import os
+import tempfile
+import unittest
+from pypdf import PdfWriter
+
+from src.pdf_processing.processor import PDFProcessor
+from src.pdf_processing.source import MemoryViewStream, PDFSource
+
+class TestPDFSource(unittest.TestCase):
+
+    def setUp(self):
+        writer = PdfWriter()
+        for _ in range(3):
+            writer.add_blank_page(width=72, height=72)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        self.pdf_bytes = buffer.getvalue()
+        self.processor = PDFProcessor()
+
+    def test_memoryview_stream(self):
+        stream = MemoryViewStream(bytearray(b"0123456789"))
+        self.assertEqual(stream.read(3), b"012")
+        stream.seek(-2, io.SEEK_END)
+        self.assertEqual(stream.read(), b"89")
+        buffer = bytearray(4)
+        stream.seek(4)
+        self.assertEqual(stream.readinto(buffer), 4)
+        self.assertEqual(bytes(buffer), b"4567")
+        self.assertEqual(stream.tell(), 8)
+
+    def test_extract_from_buffers(self):
+        for pdf in (self.pdf_bytes, bytearray(self.pdf_bytes), memoryview(self.pdf_bytes), io.BytesIO(self.pdf_bytes)):
+            self.assertEqual(len(self.processor.extract_content(pdf)), 3)
+
+    def test_bytesio_is_shared_not_copied(self):
+        source = PDFSource.from_input(io.BytesIO(self.pdf_bytes))
+        self.assertIsInstance(source.data, memoryview)
+        self.assertEqual(source.nbytes, len(self.pdf_bytes))
+
+    def test_file_object_is_reusable(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(b"junk")
+            f.write(self.pdf_bytes)
+            f.seek(4)
+            source = PDFSource.from_input(f)
+            # The same source serves several extractions and the file is rewound after each
+            self.assertEqual(len(self.processor.extract_content(source)), 3)
+            self.assertEqual(len(self.processor.extract_content(source)), 3)
+            self.assertEqual(f.tell(), 4)
+            self.assertFalse(f.closed)
+
+    def test_large_files_are_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "doc.pdf")
+            with open(path, "wb") as f:
+                f.write(self.pdf_bytes)
+            with PDFSource(path=path, mmap_threshold=0) as source:
+                self.assertEqual(len(self.processor.extract_content(source)), 3)
+                self.assertIsNotNone(source._mmap)
+            self.assertIsNone(source._mmap)
+            # Plain paths still work and leave nothing mapped behind
+            self.assertEqual(len(self.processor.extract_content(path)), 3)
+
+    def test_unsupported_input(self):
+        with self.assertRaises(TypeError):
+            PDFSource.from_input(42)
+
+if __name__ == "__main__":
+    unittest.main()
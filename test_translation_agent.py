@@ -1,6 +1,8 @@
+import re
 import unittest
 from unittest.mock import MagicMock, patch
 from src.agents.translation_agent import TranslationAgent
+from src.agents.translation_memory import TranslationMemory
 from src.llm_providers.base import LLMProvider
 from src.pdf_processing.processor import PDFProcessor
 
@@ -30,6 +32,55 @@ class TestTranslationAgent(unittest.TestCase):
         self.mock_pdf_processor.extract_content.assert_called_once_with("dummy.pdf")
         self.mock_llm_provider.generate_text.assert_called_once()
 
+    def _fake_batch_translation(self, prompt):
+        parts = re.split(r"^\[\[(\d+)\]\]$", prompt.split("\n\n", 1)[1], flags=re.MULTILINE)
+        return "\n".join(f"[[{n}]]\nES {text.strip()}" for n, text in zip(parts[1::2], parts[2::2]))
+
+    def test_run_with_translation_memory(self):
+        self.agent.translation_memory = TranslationMemory()
+        self.mock_llm_provider.get_model_name.return_value = "test-model"
+        self.mock_pdf_processor.extract_content.return_value = [
+            {"page_number": 1, "text": "", "sections": [{"heading": "Page 1", "paragraphs": ["Confidential", "Hello world."]}]},
+            {"page_number": 2, "text": "", "sections": [{"heading": "Page 2", "paragraphs": ["Confidential", "Goodbye."]}]},
+        ]
+        self.mock_llm_provider.generate_text.side_effect = self._fake_batch_translation
+
+        result = self.agent.run("dummy.pdf", "Spanish")
+
+        # Five distinct segments ("Page 1" and "Page 2" included) fit in one batched prompt
+        self.mock_llm_provider.generate_text.assert_called_once()
+        sections = [page["translated_sections"][0] for page in result["translated_content"]]
+        self.assertEqual(sections[0]["translated_text"], "ES Page 1\nES Confidential\nES Hello world.")
+        self.assertEqual(sections[1]["translated_text"], "ES Page 2\nES Confidential\nES Goodbye.")
+        self.assertEqual(result["translation_memory"]["segments"], 6)
+        self.assertEqual(result["translation_memory"]["misses"], 5)
+
+        # A later document reuses everything: exact hits, and "Page 3" as a near match of "Page 1"
+        self.mock_llm_provider.generate_text.reset_mock()
+        self.mock_pdf_processor.extract_content.return_value = [
+            {"page_number": 3, "text": "", "sections": [{"heading": "Page 3", "paragraphs": ["Confidential", "Goodbye."]}]},
+        ]
+        result = self.agent.run("other.pdf", "Spanish")
+
+        self.mock_llm_provider.generate_text.assert_not_called()
+        self.assertEqual(result["translated_content"][0]["translated_sections"][0]["translated_text"], "ES Page 3\nES Confidential\nES Goodbye.")
+        self.assertEqual(result["translation_memory"]["near_hits"], 1)
+        self.assertEqual(result["translation_memory"]["reuse_ratio"], 1.0)
+
+    def test_run_with_translation_memory_falls_back_without_markers(self):
+        self.agent.translation_memory = TranslationMemory()
+        self.mock_llm_provider.get_model_name.return_value = "test-model"
+        self.mock_pdf_processor.extract_content.return_value = [
+            {"page_number": 1, "text": "", "sections": [{"heading": "Title", "paragraphs": ["Hello world."]}]}
+        ]
+        self.mock_llm_provider.generate_text.return_value = "Hola mundo."
+
+        result = self.agent.run("dummy.pdf", "Spanish")
+
+        # One batched attempt, then one call per segment
+        self.assertEqual(self.mock_llm_provider.generate_text.call_count, 3)
+        self.assertEqual(result["translation_memory"]["llm_calls"], 3)
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from src.agents.translation_memory import TranslationMemory, fuzzy_key, normalize_segment
+
+class TestTranslationMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.memory = TranslationMemory()
+
+    def test_normalization(self):
+        self.assertEqual(normalize_segment("  Hello \n world "), "Hello world")
+        self.assertEqual(fuzzy_key("Page 3 of 10."), fuzzy_key("PAGE 4, of 12."))
+        self.assertEqual(fuzzy_key("ISO-9001 audit"), fuzzy_key("ISO 9001 audit"))
+
+    def test_exact_and_near_lookup(self):
+        self.memory.store("Page 2 of 10", "Página 2 de 10", "en", "es", "gpt")
+
+        self.assertEqual(self.memory.lookup("Page  2 of 10", "en", "es", "gpt"), ("Página 2 de 10", "exact"))
+        self.assertEqual(self.memory.lookup("Page 7 of 12", "en", "es", "gpt"), ("Página 7 de 12", "near"))
+        # Scoped by language pair and model
+        self.assertEqual(self.memory.lookup("Page 2 of 10", "en", "fr", "gpt"), (None, None))
+        self.assertEqual(self.memory.lookup("Page 2 of 10", "en", "es", "llama"), (None, None))
+
+    def test_near_lookup_rejects_unmappable_numbers(self):
+        self.memory.store("Clause 2 applies", "La cláusula dos se aplica", "en", "es", "gpt")
+        self.assertEqual(self.memory.lookup("Clause 3 applies", "en", "es", "gpt"), (None, None))
+
+    def test_near_lookup_keeps_sign(self):
+        self.memory.store("Net change: -5%", "Variación neta: -5%", "en", "es", "gpt")
+
+        self.assertEqual(self.memory.lookup("Net change: 5%", "en", "es", "gpt"), (None, None))
+        self.assertEqual(self.memory.lookup("Net change: -7%", "en", "es", "gpt"), ("Variación neta: -7%", "near"))
+
+    def test_near_lookup_keeps_final_punctuation(self):
+        self.memory.store("Do not sign.", "No firme.", "en", "es", "gpt")
+
+        self.assertEqual(self.memory.lookup("Do not sign?", "en", "es", "gpt"), (None, None))
+        self.assertEqual(self.memory.lookup("DO NOT SIGN.", "en", "es", "gpt"), ("No firme.", "near"))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "tm.sqlite")
+            memory = TranslationMemory(path)
+            memory.store("Confidential", "Confidencial", "en", "es", "gpt")
+            memory.close()
+
+            reopened = TranslationMemory(path)
+            self.assertEqual(len(reopened), 1)
+            self.assertEqual(reopened.lookup("Confidential", "en", "es", "gpt"), ("Confidencial", "exact"))
+            reopened.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,15 @@
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 from src.llm_providers.base import LLMProvider
+from src.pdf_processing.document import Document, as_document
 from src.pdf_processing.processor import PDFProcessor
+from src.pdf_processing.source import PDFInput
+from src.instrumentation import traced, record, get_tracer
 from .base import Agent
+from .translation_memory import TranslationMemory, normalize_segment
+
+_SEGMENT_MARKER_RE = re.compile(r"^\[\[(\d+)\]\]\s*$", re.MULTILINE)
 
 # This is a placeholder for PDF reconstruction. 
 # Actual PDF reconstruction maintaining structure is complex and might require external libraries
@@ -15,23 +22,31 @@ class TranslationAgent(Agent):
     description: str = "Translates the entire PDF content into a user-selected language, maintaining structure and contextual integrity."
     llm_provider: LLMProvider
     pdf_processor: PDFProcessor
+    # When set, sections are split into segments that are looked up in the memory first,
+    # and only the misses are sent to the LLM, several short segments per prompt.
+    translation_memory: Optional[TranslationMemory] = None
+    batch_char_limit: int = 2000
+    batch_max_segments: int = 20
 
-    def run(self, pdf_path: str, target_language: str) -> Dict[str, Any]:
-        extracted_content = self.pdf_processor.extract_content(pdf_path)
+    @traced("agent.run")
+    def run(self, pdf_path: PDFInput, target_language: str, source_language: str = "auto") -> Dict[str, Any]:
+        document = as_document(self.pdf_processor.extract_content(pdf_path))
+        if self.translation_memory is not None:
+            return self._run_with_memory(document, source_language, target_language)
         translated_content = []
 
-        for page_content in extracted_content:
+        for page in document:
             translated_page_sections = []
-            for section in page_content["sections"]:
-                original_text = section["heading"] + "\\n" + "\\n".join(section["paragraphs"])
+            for section in page.sections:
+                original_text = section.heading + "\\n" + "\\n".join(section.paragraphs)
                 prompt = f"Translate the following text into {target_language}, maintaining its structure and context:\n\n{original_text}"
                 translated_text = self.llm_provider.generate_text(prompt)
                 translated_page_sections.append({
-                    "heading": section["heading"], # Heading might need to be translated separately or identified in translated_text
+                    "heading": section.heading, # Heading might need to be translated separately or identified in translated_text
                     "translated_text": translated_text
                 })
             translated_content.append({
-                "page_number": page_content["page_number"],
+                "page_number": page.page_number,
                 "translated_sections": translated_page_sections
             })
         
@@ -39,4 +54,85 @@ class TranslationAgent(Agent):
         # For now, we return the translated text content.
         return {"translated_content": translated_content, "message": "PDF content translated. PDF reconstruction is a complex task and is not fully implemented in this example."}
 
+    def _run_with_memory(self, document: Document, source_language: str, target_language: str) -> Dict[str, Any]:
+        model = self.llm_provider.get_model_name()
+        stats = {"segments": 0, "exact_hits": 0, "near_hits": 0, "misses": 0, "llm_calls": 0}
+
+        # Resolve every distinct segment once, so boilerplate repeated on many pages costs one lookup.
+        translations: Dict[str, Optional[str]] = {}
+        for section in document.sections:
+            for segment in [section.heading, *section.paragraphs]:
+                stats["segments"] += 1
+                key = normalize_segment(segment)
+                if key in translations:
+                    stats["exact_hits"] += 1
+                    continue
+                translation, kind = self.translation_memory.lookup(key, source_language, target_language, model)
+                if kind:
+                    stats[f"{kind}_hits"] += 1
+                translations[key] = translation
+        misses = [key for key, translation in translations.items() if translation is None]
+        stats["misses"] = len(misses)
+
+        for batch in self._batch_segments(misses):
+            for segment, translation in zip(batch, self._translate_batch(batch, target_language, stats)):
+                translations[segment] = translation
+                self.translation_memory.store(segment, translation, source_language, target_language, model)
+
+        translated_content = []
+        for page in document:
+            translated_page_sections = []
+            for section in page.sections:
+                translated_segments = [translations[normalize_segment(segment)] for segment in [section.heading, *section.paragraphs]]
+                translated_page_sections.append({
+                    "heading": section.heading,
+                    "translated_heading": translated_segments[0],
+                    "translated_text": "\n".join(translated_segments)
+                })
+            translated_content.append({
+                "page_number": page.page_number,
+                "translated_sections": translated_page_sections
+            })
+
+        reused = stats["exact_hits"] + stats["near_hits"]
+        stats["reuse_ratio"] = reused / stats["segments"] if stats["segments"] else 0.0
+        record(cache_hits=reused, cache_misses=stats["misses"])
+        get_tracer().metric("translation_memory.hits", reused, target_language=target_language, model=model)
+        get_tracer().metric("translation_memory.misses", stats["misses"], target_language=target_language, model=model)
+        return {
+            "translated_content": translated_content,
+            "translation_memory": stats,
+            "message": "PDF content translated. PDF reconstruction is a complex task and is not fully implemented in this example."
+        }
+
+    def _batch_segments(self, segments: List[str]) -> List[List[str]]:
+        batches, current, size = [], [], 0
+        for segment in segments:
+            if current and (size + len(segment) > self.batch_char_limit or len(current) >= self.batch_max_segments):
+                batches.append(current)
+                current, size = [], 0
+            current.append(segment)
+            size += len(segment)
+        if current:
+            batches.append(current)
+        return batches
 
+    def _translate_batch(self, segments: List[str], target_language: str, stats: Dict[str, Any]) -> List[str]:
+        if len(segments) > 1:
+            numbered = "\n".join(f"[[{i}]]\n{segment}" for i, segment in enumerate(segments, start=1))
+            prompt = (
+                f"Translate each numbered segment below into {target_language}, maintaining its structure and context. "
+                f"Reply with the same [[n]] markers, each on its own line followed by the translation of that segment, and nothing else.\n\n{numbered}"
+            )
+            stats["llm_calls"] += 1
+            parts = _SEGMENT_MARKER_RE.split(self.llm_provider.generate_text(prompt))
+            parsed = {int(number): text.strip() for number, text in zip(parts[1::2], parts[2::2])}
+            if sorted(parsed) == list(range(1, len(segments) + 1)):
+                return [parsed[i] for i in range(1, len(segments) + 1)]
+            # The model did not keep the markers; translate the segments one by one instead.
+        translated = []
+        for segment in segments:
+            prompt = f"Translate the following text into {target_language}, maintaining its structure and context:\n\n{segment}"
+            stats["llm_calls"] += 1
+            translated.append(self.llm_provider.generate_text(prompt))
+        return translated
@@ -0,0 +1,109 @@
+import re
+import sqlite3
+import threading
+import unicodedata
+from typing import Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# A leading sign is part of the number unless it joins two words, as in "ISO-9001".
+_NUMBER_RE = re.compile(r"((?<!\w)[-+])?\d+(?:[.,:/-]\d+)*")
+# Punctuation, except a sign that starts a masked number.
+_PUNCTUATION_RE = re.compile(r"(?:[^\w#+-]|[+-](?!#)|(?<=\w)[+-])+")
+_FINAL_PUNCTUATION_RE = re.compile(r"[.?!]+(?=[^\w.?!]*$)")
+
+def normalize_segment(text: str) -> str:
+    """Exact-match key: Unicode-normalized text with whitespace collapsed."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+def fuzzy_key(text: str) -> str:
+    """Near-match key: ignores case, inner punctuation and the value of numbers.
+
+    The sign of numbers and the sentence-final punctuation are kept, since they change
+    the meaning ("-5%" vs "5%", "Do not sign?" vs "Do not sign.").
+    """
+    normalized = normalize_segment(text).casefold()
+    masked = _NUMBER_RE.sub(lambda match: (match.group(1) or "") + "#", normalized)
+    key = _PUNCTUATION_RE.sub(" ", masked).strip()
+    final = _FINAL_PUNCTUATION_RE.search(normalized)
+    return f"{key} {final.group(0)}" if final else key
+
+def _transfer_numbers(source: str, translation: str, new_source: str) -> Optional[str]:
+    """Rewrites the numbers of a cached translation to those of `new_source`.
+
+    Returns None when the numbers cannot be mapped one-to-one, e.g. because the
+    translation reformatted them, so that the segment is sent to the LLM instead.
+    """
+    old_numbers = [match.group(0) for match in _NUMBER_RE.finditer(source)]
+    new_numbers = [match.group(0) for match in _NUMBER_RE.finditer(new_source)]
+    if len(old_numbers) != len(new_numbers):
+        return None
+    position = 0
+
+    def substitute(match):
+        nonlocal position
+        if position < len(old_numbers) and match.group(0) == old_numbers[position]:
+            position += 1
+            return new_numbers[position - 1]
+        return match.group(0)
+
+    rewritten = _NUMBER_RE.sub(substitute, translation)
+    return rewritten if position == len(old_numbers) else None
+
+class TranslationMemory:
+    """Persistent segment-level translation cache backed by SQLite.
+
+    Entries are keyed by (normalized segment, source language, target language, model).
+    Lookups try an exact match first, then a near-exact match that tolerates differences
+    in case, inner punctuation and numbers (e.g. "Page 3 of 10" reuses "Page 2 of 10").
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                " source_key TEXT NOT NULL, fuzzy_key TEXT NOT NULL,"
+                " source_language TEXT NOT NULL, target_language TEXT NOT NULL, model TEXT NOT NULL,"
+                " source_text TEXT NOT NULL, translation TEXT NOT NULL,"
+                " PRIMARY KEY (source_key, source_language, target_language, model))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS segments_fuzzy ON segments (fuzzy_key, source_language, target_language, model)"
+            )
+
+    def lookup(self, segment: str, source_language: str, target_language: str, model: str) -> Tuple[Optional[str], Optional[str]]:
+        """Returns (translation, "exact" | "near"), or (None, None) on a miss."""
+        scope = (source_language, target_language, model)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT translation FROM segments WHERE source_key = ? AND source_language = ? AND target_language = ? AND model = ?",
+                (normalize_segment(segment), *scope),
+            ).fetchone()
+            if row:
+                return row[0], "exact"
+            candidates = self._connection.execute(
+                "SELECT source_text, translation FROM segments WHERE fuzzy_key = ? AND source_language = ? AND target_language = ? AND model = ? LIMIT 5",
+                (fuzzy_key(segment), *scope),
+            ).fetchall()
+        for source_text, translation in candidates:
+            rewritten = _transfer_numbers(source_text, translation, segment)
+            if rewritten is not None:
+                return rewritten, "near"
+        return None, None
+
+    def store(self, segment: str, translation: str, source_language: str, target_language: str, model: str):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_segment(segment), fuzzy_key(segment), source_language, target_language, model, segment, translation),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()